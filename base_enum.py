@@ -8,7 +8,18 @@ class BaseEnum(Enum):
         has issues when classes are imported from two different locations
 
         As such we define equality to work on a string comparison instead.
+        Members are singletons, so identity is checked first, and the string
+        comparison is only needed when the classes differ.
         """
+        if self is __value:
+            return True
         if self.__class__.__name__ == __value.__class__.__name__:
             return self.value == __value.value
         return False
+
+    def __hash__(self) -> int:
+        """
+        Consistent with __eq__: members that compare equal across imports
+        share a class name and value, so hash those.
+        """
+        return hash((self.__class__.__name__, self._value_))
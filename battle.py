@@ -1,10 +1,14 @@
 from __future__ import annotations
 from enum import auto
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 from base_enum import BaseEnum
+from elements import EffectivenessCalculator
 from team import MonsterTeam
 
+if TYPE_CHECKING:
+    from monster_base import MonsterBase
+
 
 class Battle:
 
@@ -18,11 +22,15 @@ class Battle:
         TEAM2 = auto()
         DRAW = auto()
 
-    def __init__(self, verbosity=0) -> None:
+    def __init__(self, verbosity=0, fast=False) -> None:
         """
         O(1): Simply assigns the value
+
+        :fast: Whether to run battles with the fast engine, see _fast_battle.
         """
         self.verbosity = verbosity
+        self.fast = fast
+        self.calculator = None
 
     def process_turn(self) -> Optional[Battle.Result]:
         """
@@ -37,47 +45,95 @@ class Battle:
         All the calculations perform require a single step and involve simple arthimetic based on relevant variables.
         """
         # Determine the actions for each team
-        action1 = self.out1.choose_action(self.out1, self.out2)
-        action2 = self.out2.choose_action(self.out2, self.out1)
+        action1 = self.team1.choose_action(self.out1, self.out2)
+        action2 = self.team2.choose_action(self.out2, self.out1)
 
-        # Process actions for both teams
-        if action1 == Battle.Action.ATTACK:
-            damage1 = self.out1.get_attack() - self.out2.get_defense()
-            self.out2.reduce_hp(damage1)
+        # Swaps and specials happen before any attacks
+        self.out1 = self.apply_team_action(self.team1, self.out1, action1)
+        self.out2 = self.apply_team_action(self.team2, self.out2, action2)
 
-        if action2 == Battle.Action.ATTACK:
-            damage2 = self.out2.get_attack() - self.out1.get_defense()
-            self.out1.reduce_hp(damage2)
+        # Process attacks. The faster monster attacks first, and a monster that faints
+        # doesn't attack back. Monsters with the same speed attack at the same time.
+        attack1 = action1 == Battle.Action.ATTACK
+        attack2 = action2 == Battle.Action.ATTACK
+        if attack1 and attack2:
+            speed1, speed2 = self.out1.get_speed(), self.out2.get_speed()
+            if speed1 > speed2:
+                self.out1.attack(self.out2, self.calculator)
+                attack1, attack2 = False, self.out2.alive()
+            elif speed2 > speed1:
+                self.out2.attack(self.out1, self.calculator)
+                attack1, attack2 = self.out1.alive(), False
+        if attack1:
+            self.out1.attack(self.out2, self.calculator)
+        if attack2:
+            self.out2.attack(self.out1, self.calculator)
 
-        # Handle fainted monsters
-        if self.out1.is_fainted():
-            if self.team1.has_remaining_monsters():
-                self.out1 = self.team1.retrieve_from_team()
-            else:
-                return Battle.Result.TEAM2
+        # Subtract 1 from HP if both monsters survive
+        if self.out1.alive() and self.out2.alive():
+            self.out1.set_hp(self.out1.get_hp() - 1)
+            self.out2.set_hp(self.out2.get_hp() - 1)
 
-        if self.out2.is_fainted():
-            if self.team2.has_remaining_monsters():
-                self.out2 = self.team2.retrieve_from_team()
-            else:
-                return Battle.Result.TEAM1
+        # Handle fainted monsters
+        fainted1 = not self.out1.alive()
+        fainted2 = not self.out2.alive()
+        result = self.game_result(fainted1, fainted2)
+        if result is not None:
+            return result
 
         # Handle level ups and evolutions
-        self.out1.check_for_level_up_or_evolution()
-        self.out2.check_for_level_up_or_evolution()
+        if fainted2 and not fainted1:
+            self.out1 = self.level_up_or_evolve(self.out1)
+        if fainted1 and not fainted2:
+            self.out2 = self.level_up_or_evolve(self.out2)
 
-        # Subtract 1 from HP if both monsters survive
-        if not self.out1.is_fainted() and not self.out2.is_fainted():
-            self.out1.reduce_hp(1)
-            self.out2.reduce_hp(1)
+        if fainted1:
+            self.out1 = self.team1.retrieve_from_team()
+        if fainted2:
+            self.out2 = self.team2.retrieve_from_team()
+        return None
 
-        # Checks for the battle result
-        if self.team1.is_defeated():
+    def game_result(self, fainted1: bool, fainted2: bool) -> Optional[Battle.Result]:
+        """
+        Checks for the battle result, given which of the monsters out have fainted.
+        O(1)
+        """
+        defeated1 = fainted1 and len(self.team1) == 0
+        defeated2 = fainted2 and len(self.team2) == 0
+        if defeated1 and defeated2:
+            return Battle.Result.DRAW
+        elif defeated1:
             return Battle.Result.TEAM2
-        elif self.team2.is_defeated():
+        elif defeated2:
             return Battle.Result.TEAM1
-        else:
-            return None
+        return None
+
+    @staticmethod
+    def apply_team_action(team: MonsterTeam, out: MonsterBase, action: Battle.Action) -> MonsterBase:
+        """
+        Performs a SWAP or SPECIAL action, returning the monster now out.
+        Best case: O(1) - For ATTACK, nothing happens.
+        Worst case: O(n) - Dependent on the team's special.
+        """
+        if action == Battle.Action.SWAP:
+            team.add_to_team(out)
+            return team.retrieve_from_team()
+        elif action == Battle.Action.SPECIAL:
+            team.add_to_team(out)
+            team.special()
+            return team.retrieve_from_team()
+        return out
+
+    @staticmethod
+    def level_up_or_evolve(monster: MonsterBase) -> MonsterBase:
+        """
+        Levels up a monster that has defeated its opponent, evolving it if ready.
+        O(1)
+        """
+        monster.level_up()
+        if monster.ready_to_evolve():
+            return monster.evolve()
+        return monster
 
     def battle(self, team1: MonsterTeam, team2: MonsterTeam) -> Battle.Result:
         """
@@ -90,6 +146,9 @@ class Battle:
         self.turn_number = 0
         self.team1 = team1
         self.team2 = team2
+        # The whole battle uses the effectiveness table current at its start, even if
+        # EffectivenessCalculator.reload() swaps in another part way through.
+        self.calculator = EffectivenessCalculator.instance
         
         # Check if either team has no available monsters
         if len(team1) == 0:
@@ -101,12 +160,144 @@ class Battle:
 
         self.out1 = team1.retrieve_from_team()
         self.out2 = team2.retrieve_from_team()
+        if self.fast:
+            return self._fast_battle()
         result = None
         while result is None:
+            self.turn_number += 1
             result = self.process_turn()
         # Add any postgame logic here.
         return result
 
+    def _fast_battle(self) -> Battle.Result:
+        """
+        Runs the rest of the battle with the same rules as process_turn, but with the HP and
+        speed of both monsters out, and the damage each deals to the other, held in local
+        variables. These are only re-read when a monster is swapped in, levels up or evolves.
+        HP is written back to the monsters whenever a team's own choose_action needs to see
+        it, and when a monster leaves the field.
+
+        Best case: O(1) - When the battle ends on the first turn.
+        Worst case: O(n) - Dependent on the number of turns (n) during the battle.
+        """
+        team1, team2 = self.team1, self.team2
+        out1, out2 = self.out1, self.out2
+        calculator = self.calculator
+        ATTACK = Battle.Action.ATTACK
+        # The default strategy only needs speed and HP, so it can be inlined.
+        default1 = _uses_default_choice(team1)
+        default2 = _uses_default_choice(team2)
+        choose1, choose2 = team1.choose_action, team2.choose_action
+
+        hp1, spd1 = out1.get_hp(), out1.get_speed()
+        hp2, spd2 = out2.get_hp(), out2.get_speed()
+        dmg1, dmg2 = out1.damage_against(out2, calculator), out2.damage_against(out1, calculator)
+        turns = self.turn_number
+
+        while True:
+            if default1 and default2:
+                # Both monsters keep attacking until something faints, so skip ahead.
+                skipped = _steady_turns(hp1, dmg2 + 1, spd1, hp2, dmg1 + 1, spd2)
+                if skipped > 0:
+                    hp1 -= skipped * (dmg2 + 1)
+                    hp2 -= skipped * (dmg1 + 1)
+                    turns += skipped
+            turns += 1
+            if default1:
+                action1 = ATTACK if spd1 >= spd2 or hp1 >= hp2 else Battle.Action.SWAP
+            else:
+                out1.set_hp(hp1)
+                out2.set_hp(hp2)
+                action1 = choose1(out1, out2)
+            if default2:
+                action2 = ATTACK if spd2 >= spd1 or hp2 >= hp1 else Battle.Action.SWAP
+            else:
+                out1.set_hp(hp1)
+                out2.set_hp(hp2)
+                action2 = choose2(out2, out1)
+
+            attack1 = action1 == ATTACK
+            attack2 = action2 == ATTACK
+            if not attack1 or not attack2:
+                if not attack1:
+                    out1.set_hp(hp1)
+                    out1 = self.apply_team_action(team1, out1, action1)
+                    hp1, spd1 = out1.get_hp(), out1.get_speed()
+                if not attack2:
+                    out2.set_hp(hp2)
+                    out2 = self.apply_team_action(team2, out2, action2)
+                    hp2, spd2 = out2.get_hp(), out2.get_speed()
+                dmg1, dmg2 = out1.damage_against(out2, calculator), out2.damage_against(out1, calculator)
+
+            # The faster monster attacks first, and only survivors attack back.
+            if attack1 and attack2:
+                if spd1 > spd2:
+                    hp2 -= dmg1
+                    attack1, attack2 = False, hp2 > 0
+                elif spd2 > spd1:
+                    hp1 -= dmg2
+                    attack1, attack2 = hp1 > 0, False
+            if attack1:
+                hp2 -= dmg1
+            if attack2:
+                hp1 -= dmg2
+
+            # Subtract 1 from HP if both monsters survive
+            if hp1 > 0 and hp2 > 0:
+                hp1 -= 1
+                hp2 -= 1
+
+            fainted1 = hp1 <= 0
+            fainted2 = hp2 <= 0
+            if fainted1 or fainted2:
+                out1.set_hp(hp1)
+                out2.set_hp(hp2)
+                result = self.game_result(fainted1, fainted2)
+                if result is not None:
+                    break
+                if fainted2 and not fainted1:
+                    out1 = self.level_up_or_evolve(out1)
+                if fainted1 and not fainted2:
+                    out2 = self.level_up_or_evolve(out2)
+                if fainted1:
+                    out1 = team1.retrieve_from_team()
+                if fainted2:
+                    out2 = team2.retrieve_from_team()
+                hp1, spd1 = out1.get_hp(), out1.get_speed()
+                hp2, spd2 = out2.get_hp(), out2.get_speed()
+                dmg1, dmg2 = out1.damage_against(out2, calculator), out2.damage_against(out1, calculator)
+
+        self.out1, self.out2 = out1, out2
+        self.turn_number = turns
+        return result
+
+def _steady_turns(hp1: int, loss1: int, spd1: int, hp2: int, loss2: int, spd2: int) -> int:
+    """
+    Returns how many whole turns can be skipped in which both monsters attack with the default
+    choose_action, nothing faints and nothing levels up. Each such turn, monster 1 loses `loss1`
+    HP (damage taken plus the 1 HP chip) and monster 2 loses `loss2`.
+
+    Best case: O(1)
+    Worst case: O(1) - The number of turns is found with arithmetic rather than simulation.
+    """
+    # Turn j is safe while hp - j * loss > 0 for both monsters.
+    turns = min((hp1 - 1) // loss1, (hp2 - 1) // loss2)
+    if spd1 != spd2:
+        if spd1 < spd2:
+            hp1, loss1, hp2, loss2 = hp2, loss2, hp1, loss1
+        # The slower monster only attacks while its HP is at least the faster one's.
+        # At the start of turn j the gap is (hp2 - hp1) - (j - 1) * (loss2 - loss1).
+        gap = hp2 - hp1
+        if gap < 0:
+            return 0
+        if loss2 > loss1:
+            turns = min(turns, gap // (loss2 - loss1) + 1)
+    return max(turns, 0)
+
+def _uses_default_choice(team: MonsterTeam) -> bool:
+    """Whether the team chooses actions with MonsterTeam.choose_action. O(1)"""
+    return "choose_action" not in vars(team) and type(team).choose_action is MonsterTeam.choose_action
+
 if __name__ == "__main__":
     t1 = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
     t2 = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
@@ -91,6 +91,10 @@ class BSet(Set[int]):
         res.elems = self.elems & ~other.elems
         return res
 
+    def to_list(self) -> list[int]:
+        """ Returns the elements of the set in increasing order. """
+        return [item for item in range(1, int.bit_length(self.elems) + 1) if item in self]
+
     def __and__(self, other: BSet):
         return self.intersection(other)
 
@@ -0,0 +1,202 @@
+""" Min-max heap, a double ended priority queue implemented with arrays.
+
+Both the smallest and the largest item can be removed in O(log n).
+Nodes on even depths are no larger than any of their descendants,
+and nodes on odd depths are no smaller than any of their descendants.
+Also defines UnitTests for the class.
+"""
+__docformat__ = 'reStructuredText'
+
+import unittest
+from typing import Generic
+from data_structures.referential_array import ArrayR, T
+
+class MinMaxHeap(Generic[T]):
+    """ Min-max heap of comparable items.
+
+    Attributes:
+         length (int): number of items in the heap
+         array (ArrayR[T]): array storing the items of the heap
+
+    ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
+    The array doubles in size whenever an item is added to a full heap.
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, capacity: int) -> None:
+        self.length = 0
+        self.array = ArrayR(max(self.MIN_CAPACITY, capacity))
+
+    def __len__(self) -> int:
+        """ Returns the number of items in the heap. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """ True if the heap is empty. """
+        return self.length == 0
+
+    def is_full(self) -> bool:
+        """ True if the array is full, and must grow before the next add. """
+        return self.length == len(self.array)
+
+    def clear(self) -> None:
+        """ Removes all items from the heap. """
+        for i in range(self.length):
+            self.array[i] = None
+        self.length = 0
+
+    def add(self, item: T) -> None:
+        """ Adds an item to the heap.
+        :complexity: O(log n) amortised, O(n) when the array grows
+        """
+        if self.is_full():
+            self._resize()
+        array = self.array
+        i = self.length
+        array[i] = item
+        self.length += 1
+        if i == 0:
+            return
+        parent = (i - 1) // 2
+        if _on_min_level(i):
+            if array[parent] < item:
+                array[i], array[parent] = array[parent], array[i]
+                self._rise(parent, False)
+            else:
+                self._rise(i, True)
+        else:
+            if item < array[parent]:
+                array[i], array[parent] = array[parent], array[i]
+                self._rise(parent, True)
+            else:
+                self._rise(i, False)
+
+    def peek_min(self) -> T:
+        """ Returns the smallest item.
+        :complexity: O(1)
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        return self.array[0]
+
+    def peek_max(self) -> T:
+        """ Returns the largest item.
+        :complexity: O(1)
+        :raises IndexError: if the heap is empty
+        """
+        return self.array[self._max_index()]
+
+    def pop_min(self) -> T:
+        """ Removes and returns the smallest item.
+        :complexity: O(log n)
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        return self._remove(0)
+
+    def pop_max(self) -> T:
+        """ Removes and returns the largest item.
+        :complexity: O(log n)
+        :raises IndexError: if the heap is empty
+        """
+        return self._remove(self._max_index())
+
+    def _resize(self) -> None:
+        """ Resize the heap. """
+        # doubling the size of our heap
+        new_array = ArrayR(2 * len(self.array))
+
+        # copying the contents
+        for i in range(self.length):
+            new_array[i] = self.array[i]
+
+        # referring to the new array
+        self.array = new_array
+
+    def _max_index(self) -> int:
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        if self.length == 1:
+            return 0
+        if self.length == 2 or self.array[2] < self.array[1]:
+            return 1
+        return 2
+
+    def _remove(self, index: int) -> T:
+        array = self.array
+        item = array[index]
+        self.length -= 1
+        array[index] = array[self.length]
+        array[self.length] = None
+        if index < self.length:
+            self._sink(index, _on_min_level(index))
+        return item
+
+    def _rise(self, i: int, is_min: bool) -> None:
+        """ Moves item i up through the grandparents on its own kind of level. """
+        array = self.array
+        while i > 2:
+            grandparent = ((i - 1) // 2 - 1) // 2
+            if (array[i] < array[grandparent]) if is_min else (array[grandparent] < array[i]):
+                array[i], array[grandparent] = array[grandparent], array[i]
+                i = grandparent
+            else:
+                break
+
+    def _sink(self, i: int, is_min: bool) -> None:
+        """ Moves item i down until it is in order with its children and grandchildren. """
+        array = self.array
+        n = self.length
+        while 2 * i + 1 < n:
+            # Find the smallest (or largest) of the children and grandchildren
+            best = 2 * i + 1
+            for candidate in (2 * i + 2, 4 * i + 3, 4 * i + 4, 4 * i + 5, 4 * i + 6):
+                if candidate >= n:
+                    break
+                if (array[candidate] < array[best]) if is_min else (array[best] < array[candidate]):
+                    best = candidate
+            if not ((array[best] < array[i]) if is_min else (array[i] < array[best])):
+                break
+            array[i], array[best] = array[best], array[i]
+            if best <= 2 * i + 2:
+                # A child, which has no descendants out of order with i.
+                break
+            parent = (best - 1) // 2
+            if (array[parent] < array[best]) if is_min else (array[best] < array[parent]):
+                array[best], array[parent] = array[parent], array[best]
+            i = best
+
+def _on_min_level(i: int) -> bool:
+    """ Whether index i is at an even depth of the heap. """
+    return (i + 1).bit_length() % 2 == 1
+
+class TestMinMaxHeap(unittest.TestCase):
+    """ Tests for the above class."""
+
+    def test_pop_both_ends(self):
+        values = [5, 1, 9, 3, 7, 2, 8, 6, 4, 0, 11, 10]
+        heap = MinMaxHeap(len(values))
+        for value in values:
+            heap.add(value)
+        self.assertEqual(heap.peek_min(), 0)
+        self.assertEqual(heap.peek_max(), 11)
+        got = []
+        while not heap.is_empty():
+            got.append(heap.pop_min() if len(got) % 2 == 0 else heap.pop_max())
+        self.assertEqual(got, [0, 11, 1, 10, 2, 9, 3, 8, 4, 7, 5, 6])
+
+    def test_grow_and_empty(self):
+        heap = MinMaxHeap(1)
+        for value in range(5):
+            heap.add(value)
+        self.assertEqual(len(heap.array), 8)
+        self.assertEqual(heap.pop_max(), 4)
+        heap.clear()
+        self.assertRaises(IndexError, heap.pop_min)
+
+if __name__ == '__main__':
+    testtorun = TestMinMaxHeap()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
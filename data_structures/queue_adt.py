@@ -110,6 +110,130 @@ class CircularQueue(Queue[T]):
         self.front = 0
         self.rear = 0
 
+class CircularDeque(CircularQueue[T]):
+    """ Double ended queue on a circular array.
+
+    Elements can be added and removed at both ends in O(1). reverse() is O(1) too,
+    as it only swaps which physical end is the logical front.
+    Unlike CircularQueue, the array doubles in size when an element is added to a full deque.
+
+    Attributes:
+         reversed (bool): whether the logical front is at the physical rear
+         (plus those of CircularQueue)
+    """
+
+    def __init__(self, max_capacity: int) -> None:
+        CircularQueue.__init__(self, max_capacity)
+        self.reversed = False
+
+    def append(self, item: T) -> None:
+        """ Adds an element to the rear of the deque.
+        :complexity: O(1) amortised
+        """
+        if self.reversed:
+            self._push_front(item)
+        else:
+            self._push_rear(item)
+
+    def append_front(self, item: T) -> None:
+        """ Adds an element to the front of the deque.
+        :complexity: O(1) amortised
+        """
+        if self.reversed:
+            self._push_rear(item)
+        else:
+            self._push_front(item)
+
+    def serve(self) -> T:
+        """ Deletes and returns the element at the deque's front.
+        :raises Exception: if the deque is empty
+        """
+        if self.reversed:
+            return self._pop_rear()
+        return self._pop_front()
+
+    def serve_rear(self) -> T:
+        """ Deletes and returns the element at the deque's rear.
+        :raises Exception: if the deque is empty
+        """
+        if self.reversed:
+            return self._pop_front()
+        return self._pop_rear()
+
+    def peek(self) -> T:
+        """ Returns the element at the deque's front.
+        :raises Exception: if the deque is empty
+        """
+        if self.is_empty():
+            raise Exception("Queue is empty")
+        return self[0]
+
+    def reverse(self) -> None:
+        """ Reverses the order of the elements.
+        :complexity: O(1)
+        """
+        self.reversed = not self.reversed
+
+    def __getitem__(self, index: int) -> T:
+        """ Returns the element index places from the front.
+        :pre: 0 <= index < len(self)
+        """
+        if self.reversed:
+            return self.array[(self.rear - 1 - index) % len(self.array)]
+        return self.array[(self.front + index) % len(self.array)]
+
+    def clear(self) -> None:
+        """ Clears all elements from the deque. """
+        for i in range(self.length):
+            self.array[(self.front + i) % len(self.array)] = None
+        CircularQueue.clear(self)
+        self.reversed = False
+
+    def _push_rear(self, item: T) -> None:
+        if self.is_full():
+            self._resize()
+        self.array[self.rear] = item
+        self.rear = (self.rear + 1) % len(self.array)
+        self.length += 1
+
+    def _push_front(self, item: T) -> None:
+        if self.is_full():
+            self._resize()
+        self.front = (self.front - 1) % len(self.array)
+        self.array[self.front] = item
+        self.length += 1
+
+    def _pop_front(self) -> T:
+        if self.is_empty():
+            raise Exception("Queue is empty")
+        item = self.array[self.front]
+        self.array[self.front] = None
+        self.front = (self.front + 1) % len(self.array)
+        self.length -= 1
+        return item
+
+    def _pop_rear(self) -> T:
+        if self.is_empty():
+            raise Exception("Queue is empty")
+        self.rear = (self.rear - 1) % len(self.array)
+        item = self.array[self.rear]
+        self.array[self.rear] = None
+        self.length -= 1
+        return item
+
+    def _resize(self) -> None:
+        """ Resize the deque. """
+        # doubling the size of our deque
+        new_array = ArrayR(2 * len(self.array))
+
+        # copying the contents, unwrapping them to start at index 0
+        for i in range(self.length):
+            new_array[i] = self.array[(self.front + i) % len(self.array)]
+
+        # referring to the new array
+        self.array = new_array
+        self.front = 0
+        self.rear = self.length
 
 class TestQueue(unittest.TestCase):
     """ Tests for the above class."""
@@ -195,6 +319,31 @@ class TestQueue(unittest.TestCase):
             self.assertEqual(len(queue), 0)
             self.assertTrue(queue.is_empty())
 
+class TestCircularDeque(unittest.TestCase):
+    """ Tests for CircularDeque."""
+
+    def test_both_ends(self):
+        deque = CircularDeque(2)
+        for i in range(5):
+            deque.append(i)
+        deque.append_front(-1)
+        self.assertEqual([deque[i] for i in range(len(deque))], [-1, 0, 1, 2, 3, 4])
+        self.assertEqual(deque.serve(), -1)
+        self.assertEqual(deque.serve_rear(), 4)
+        self.assertEqual(deque.peek(), 0)
+
+    def test_reverse(self):
+        deque = CircularDeque(4)
+        for i in range(4):
+            deque.append(i)
+        deque.reverse()
+        deque.append(-1)
+        self.assertEqual([deque[i] for i in range(len(deque))], [3, 2, 1, 0, -1])
+        self.assertEqual(deque.serve(), 3)
+        deque.clear()
+        self.assertTrue(deque.is_empty())
+        self.assertRaises(Exception, deque.serve_rear)
+
 if __name__ == '__main__':
     testtorun = TestQueue()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import math
+from array import array
 from enum import auto
 from typing import Optional
 
 from base_enum import BaseEnum
 
+from data_structures.bset import BSet
 from data_structures.referential_array import ArrayR
 
 class Element(BaseEnum):
@@ -46,6 +49,42 @@ class Element(BaseEnum):
                 return elem
         raise ValueError(f"Unexpected string {string}")
 
+class ElementSet(BSet):
+    """
+    A BSet of Elements, each stored as its value.
+
+    Example:
+    ```
+    elements = ElementSet()
+    elements.add(Element.ICE.value)
+    elements.add(Element.FIRE.value)
+    print(elements.to_list())         # [Element.FIRE, Element.ICE]
+    ```
+    """
+
+    def to_list(self) -> list[Element]:
+        """Returns the Elements in the set, in Element order. O(|Element|)"""
+        return [Element(value) for value in BSet.to_list(self)]
+
+    def union(self, other: BSet) -> ElementSet:
+        """Returns a new ElementSet of the elements in either set. O(1)"""
+        return ElementSet._of(BSet.union(self, other))
+
+    def intersection(self, other: BSet) -> ElementSet:
+        """Returns a new ElementSet of the elements in both sets. O(1)"""
+        return ElementSet._of(BSet.intersection(self, other))
+
+    def difference(self, other: BSet) -> ElementSet:
+        """Returns a new ElementSet of the elements in this set but not in other. O(1)"""
+        return ElementSet._of(BSet.difference(self, other))
+
+    @staticmethod
+    def _of(elements: BSet) -> ElementSet:
+        """Returns an ElementSet holding the same elements as a plain BSet. O(1)"""
+        result = ElementSet()
+        result.elems = elements.elems
+        return result
+
 class EffectivenessCalculator:
     """
     Helper class for calculating the element effectiveness for two elements.
@@ -77,8 +116,26 @@ class EffectivenessCalculator:
         """
         self.element_names = element_names
         self.effectiveness_values = effectiveness_values
+        n = len(element_names)
+        # The names may come in any order, so map each Element to its position in element_names.
+        # Elements that are not named have no effectiveness (nan).
+        self.size = len(Element)
+        self.positions = ArrayR(self.size)
+        for i in range(n):
+            self.positions[Element.from_string(element_names[i]).value - 1] = i
+        # Contiguous copy of effectiveness_values in Element order, with a view of each attacker's row.
+        self.table = array('d', [math.nan]) * (self.size * self.size)
+        for row in range(self.size):
+            if self.positions[row] is None:
+                continue
+            for column in range(self.size):
+                if self.positions[column] is not None:
+                    value = effectiveness_values[self.positions[row] * n + self.positions[column]]
+                    self.table[row * self.size + column] = value
+        view = memoryview(self.table).toreadonly()
+        self.rows = tuple(view[i * self.size:(i + 1) * self.size] for i in range(self.size))
         """
-        The following method has a time complexity of O(n), where n is the number of elements.
+        The following method has a time complexity of O(n^2), where n is the number of elements.
         In this case, it is not practical for an O(1) complexity to be achieved due to the nature of storing the given values.
         """
 
@@ -89,19 +146,57 @@ class EffectivenessCalculator:
 
         Example: EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.WATER) == 0.5
         """
-        index1 = type1.value - 1
-        index2 = type2.value - 1
-        return cls.instance.effectiveness_values[index1 * len(cls.instance.element_names) + index2]
+        return cls.instance.effectiveness(type1, type2)
         """
         The method above has a best case and worst case complexity of O(1).
         The complexity of the equations is always identical regardless of the values or number of elements.
         """
 
+    def effectiveness(self, type1: Element, type2: Element) -> float:
+        """
+        Returns the effectiveness of type1 attacking type2 in this table, which stays the same
+        even after another table is swapped in as the singleton. O(1)
+        """
+        return self.rows[type1.value - 1][type2.value - 1]
+
+    @classmethod
+    def get_row(cls, attacker: Element) -> memoryview:
+        """
+        Returns the effectiveness of `attacker` against every element, indexed by Element.value - 1.
+        Fetch this once per attacker, then index it directly for each defender.
+
+        Example: EffectivenessCalculator.get_row(Element.FIRE)[Element.WATER.value - 1] == 0.5
+        O(1)
+        """
+        return cls.instance.rows[attacker.value - 1]
+
     @classmethod
-    def from_csv(cls, csv_file: str) -> EffectivenessCalculator:
+    def get_matrix(cls):
+        """
+        Returns the whole table as an n x n NumPy matrix sharing memory with the calculator,
+        with rows as attackers and columns as defenders. Requires NumPy.
+        O(1)
+        """
+        import numpy as np
+        instance = cls.instance
+        matrix = np.frombuffer(instance.table, dtype=np.float64).reshape(instance.size, instance.size)
+        matrix.flags.writeable = False
+        return matrix
+
+    @classmethod
+    def from_csv(cls, csv_file: str, validate: bool = False) -> EffectivenessCalculator:
+        """
+        Reads a calculator from a CSV with a header of element names, followed by one row
+        per attacking element in the same order as the header.
+
+        With validate, a ValueError is raised unless the header names every Element exactly
+        once, and there are as many rows as columns, all of non-negative values.
+        """
         with open(csv_file, "r") as file:
             header, rest = file.read().strip().split("\n", maxsplit=1)
             header = header.split(",")
+            if validate:
+                cls._validate_csv(header, rest)
             rest = rest.replace("\n", ",").split(",")
             a_header = ArrayR(len(header))
             a_all = ArrayR(len(rest))
@@ -111,10 +206,48 @@ class EffectivenessCalculator:
                 a_all[i] = float(rest[i])
             return EffectivenessCalculator(a_header, a_all)
 
+    @staticmethod
+    def _validate_csv(header: list[str], rest: str) -> None:
+        """
+        Best case: O(n^2)
+        Worst case: O(n^2) - Every value in the table is checked.
+        """
+        named = set()
+        for name in header:
+            element = Element.from_string(name)
+            if element.name in named:
+                raise ValueError(f"Element {name} appears more than once in the header")
+            named.add(element.name)
+        missing = [element.name for element in Element if element.name not in named]
+        if missing:
+            raise ValueError(f"Elements missing from the header: {', '.join(missing)}")
+        rows = rest.split("\n")
+        if len(rows) != len(header):
+            raise ValueError(f"Expected {len(header)} rows, got {len(rows)}")
+        for i, row in enumerate(rows):
+            values = row.split(",")
+            if len(values) != len(header):
+                raise ValueError(f"Row {header[i]} has {len(values)} values, expected {len(header)}")
+            for value in values:
+                if float(value) < 0:
+                    raise ValueError(f"Row {header[i]} has a negative effectiveness {value}")
+
     @classmethod
     def make_singleton(cls):
         cls.instance = EffectivenessCalculator.from_csv("type_effectiveness.csv")
 
+    @classmethod
+    def reload(cls, csv_file: str = "type_effectiveness.csv") -> EffectivenessCalculator:
+        """
+        Builds and validates a new calculator from `csv_file`, then swaps it in as the singleton
+        with a single assignment. Code holding the old instance, or rows fetched with get_row,
+        keeps seeing the old values.
+        O(n^2) - Where n is the number of elements, all before the swap.
+        """
+        calculator = EffectivenessCalculator.from_csv(csv_file, validate=True)
+        cls.instance = calculator
+        return calculator
+
 EffectivenessCalculator.make_singleton()
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
 from __future__ import annotations
+import hashlib
+import marshal
+import os
 import yaml
 from typing import TYPE_CHECKING
 
@@ -8,7 +11,16 @@ if TYPE_CHECKING:
     from monster_base import MonsterBase
 
 
-_monsters: ArrayR[MonsterBase] = None
+CATALOGUE_FILE = "monsters.yaml"
+CACHE_FILE = "monsters.cache"
+_CACHE_VERSION = 1
+
+# Set HELPERS_LAZY=1 to only create monster classes when they are first used,
+# rather than all of them at import.
+LAZY = os.environ.get("HELPERS_LAZY", "") not in ("", "0")
+
+# The current MonsterCatalogue. Replaced as a whole by reload_monsters().
+_catalogue: MonsterCatalogue = None
 
 
 def MonsterBaseFactory(name, description, evolution, element, simple_stats, complex_stats, can_be_spawned) -> type[MonsterBase]:
@@ -24,19 +36,32 @@ def MonsterBaseFactory(name, description, evolution, element, simple_stats, comp
         "can_be_spawned": classmethod(lambda s: can_be_spawned),
     })
 
-def get_all_monsters():
-    if _monsters is None:
-        _make_all_monster_classes()
-    return _monsters
-
-def _make_all_monster_classes():
-    from stats import SimpleStats, ComplexStats
-    global _monsters
-    with open("monsters.yaml", "r") as f:
-        monsters_yaml = yaml.safe_load(f)
-    _monsters = ArrayR(len(monsters_yaml))
-    idx = 0
-    for monster in monsters_yaml:
+class MonsterCatalogue:
+    """
+    A snapshot of the monster records and the classes built from them.
+
+    Classes from one snapshot only ever evolve into classes of the same snapshot, so monsters
+    in a battle keep their balance even if the catalogue is reloaded mid battle.
+    """
+
+    def __init__(self, records: list[dict]) -> None:
+        """O(n) - Where n is the number of records."""
+        self.records = {monster["name"]: monster for monster in records}
+        self.classes: dict[str, type[MonsterBase]] = {}
+        self.monsters: ArrayR[type[MonsterBase]] = None
+        self.spawnable: ArrayR[type[MonsterBase]] = None
+        self.spawnable_by_element: dict[str, ArrayR[type[MonsterBase]]] = None
+
+    def get_class(self, name: str) -> type[MonsterBase]:
+        """
+        Returns the class for the monster called `name`, creating it on first use.
+        O(1) once created, otherwise O(k) - Where k is the length of its stat formulas.
+        """
+        existing = self.classes.get(name)
+        if existing is not None:
+            return existing
+        from stats import SimpleStats, ComplexStats
+        monster = self.records[name]
         simple = monster["simple"]
         complex = monster["complex"]
         new_class = MonsterBaseFactory(
@@ -53,19 +78,160 @@ def _make_all_monster_classes():
             ),
             monster.get("can_be_spawned", False)
         )
-        globals()[monster["name"]] = new_class
-        _monsters[idx] = new_class
-        idx += 1
-    # Now assign evolution
-    for monster in monsters_yaml:
         evolution = monster.get("evolution", None)
-        if evolution is None:
-            continue
-        evolution_class = globals()[evolution]
-        globals()[monster["name"]].evolution_class = evolution_class
-        globals()[monster["name"]].get_evolution = classmethod(lambda s: s.evolution_class)
+        if evolution is not None:
+            # The evolution is only created when first asked for.
+            new_class.get_evolution = classmethod(lambda s, evolution=evolution: self.get_class(evolution))
+        self.classes[name] = new_class
+        if _catalogue is self:
+            globals()[name] = new_class
+        return new_class
+
+    def build_all(self) -> None:
+        """
+        Creates every monster class and the spawnable indexes.
+        O(n) - Where n is the number of monster classes.
+        """
+        monsters = ArrayR(len(self.records))
+        idx = 0
+        for name in self.records:
+            monsters[idx] = self.get_class(name)
+            idx += 1
+        spawnable = [monster for monster in monsters if monster.can_be_spawned()]
+        by_element: dict[str, list[type[MonsterBase]]] = {}
+        for monster in spawnable:
+            by_element.setdefault(monster.get_element(), []).append(monster)
+        self.spawnable = ArrayR.from_list(spawnable)
+        self.spawnable_by_element = {element: ArrayR.from_list(group) for element, group in by_element.items()}
+        self.monsters = monsters
+
+def get_all_monsters():
+    catalogue = _current()
+    if catalogue.monsters is None:
+        catalogue.build_all()
+    return catalogue.monsters
+
+def get_spawnable_monsters() -> ArrayR[type[MonsterBase]]:
+    """
+    All monster classes that can be spawned, in the same order as get_all_monsters().
+    O(1) - Built once alongside the monster classes.
+    """
+    catalogue = _current()
+    if catalogue.monsters is None:
+        catalogue.build_all()
+    return catalogue.spawnable
+
+def get_spawnable_monsters_by_element(element: str) -> ArrayR[type[MonsterBase]]:
+    """
+    The spawnable monster classes of a single element, e.g. "Fire".
+    O(1) - Built once alongside the monster classes.
+    """
+    catalogue = _current()
+    if catalogue.monsters is None:
+        catalogue.build_all()
+    return catalogue.spawnable_by_element.get(element, ArrayR(0))
+
+def reload_monsters() -> MonsterCatalogue:
+    """
+    Re-reads CATALOGUE_FILE into a new catalogue and swaps it in with a single assignment.
+    Monsters that already exist keep their old classes. Unless in lazy mode, the new
+    classes are all built before the swap, so callers never wait on them.
+    O(n) - Where n is the number of monster classes.
+    """
+    catalogue = MonsterCatalogue(_load_catalogue())
+    if not LAZY:
+        catalogue.build_all()
+    _swap_catalogue(catalogue)
+    return catalogue
+
+def _swap_catalogue(catalogue: MonsterCatalogue) -> None:
+    """Makes `catalogue` the current one, along with the module level monster classes. O(n)"""
+    global _catalogue
+    old = _catalogue
+    _catalogue = catalogue
+    if old is not None:
+        for name in old.classes:
+            globals().pop(name, None)
+    globals().update(catalogue.classes)
+
+def reload_balance(csv_file: str = "type_effectiveness.csv") -> None:
+    """
+    Reloads both the effectiveness table and the monster catalogue.
+    Both are read and fully built before either is swapped in, so if the CSV or the YAML
+    is invalid, the error is raised with the old table and catalogue still in place.
+
+    The two are then published with two assignments, so another thread reading between
+    them sees the new table with the old catalogue. Battles aren't affected, as each one
+    keeps the table current at its start, and monsters keep their classes.
+    Best case: O(n + e^2)
+    Worst case: O(n + e^2) - Where n is the number of monsters and e the number of elements.
+    """
+    from elements import EffectivenessCalculator
+    calculator = EffectivenessCalculator.from_csv(csv_file, validate=True)
+    catalogue = MonsterCatalogue(_load_catalogue())
+    catalogue.build_all()
+    EffectivenessCalculator.instance = calculator
+    _swap_catalogue(catalogue)
+
+def _load_catalogue() -> list[dict]:
+    """
+    Returns the parsed records of CATALOGUE_FILE.
+
+    The parse is cached in CACHE_FILE with marshal, keyed on the YAML file's mtime and size,
+    and on its SHA-1 when those do not match. YAML is only parsed when the contents changed.
+    Best case: O(1) file reads beyond the cache itself.
+    Worst case: O(n) - Where n is the size of the YAML file.
+    """
+    stat = os.stat(CATALOGUE_FILE)
+    cached = _read_cache()
+    if cached is not None and cached[1] == stat.st_mtime_ns and cached[2] == stat.st_size:
+        return cached[4]
+    with open(CATALOGUE_FILE, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw).hexdigest()
+    if cached is not None and cached[3] == digest:
+        records = cached[4]
+    else:
+        records = yaml.safe_load(raw)
+    _write_cache((_CACHE_VERSION, stat.st_mtime_ns, stat.st_size, digest, records))
+    return records
+
+def _read_cache():
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            cached = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(cached, tuple) or len(cached) != 5 or cached[0] != _CACHE_VERSION:
+        return None
+    return cached
+
+def _write_cache(cached) -> None:
+    # Write then rename, so concurrent workers never see a partial cache.
+    tmp_file = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            marshal.dump(cached, f)
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError:
+        # The cache is only an optimisation, e.g. the directory may be read only.
+        pass
+
+def _current() -> MonsterCatalogue:
+    """The current catalogue, loading it on first use. O(1) after the first call."""
+    if _catalogue is None:
+        reload_monsters()
+    return _catalogue
+
+def __getattr__(name: str):
+    """In lazy mode, monster classes are created the first time they are imported."""
+    catalogue = _current()
+    if name in catalogue.records:
+        return catalogue.get_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-get_all_monsters()
+if not LAZY:
+    get_all_monsters()
 
 if TYPE_CHECKING:
     # Makes no sense but fixes the red squigglies
@@ -0,0 +1,137 @@
+"""
+Team vs. team matchup estimates, computed for every pairing of monsters at once with NumPy.
+
+Usage:
+```
+matchup = Matchup(team1, team2)
+matchup.damage[i, j]          # Damage monster i of team 1 deals to monster j of team 2 per attack
+matchup.turns_to_faint[i, j]  # Turns monster i of team 1 needs to faint monster j of team 2
+matchup.estimate_result()     # Battle.Result.TEAM1, TEAM2 or DRAW
+```
+"""
+from __future__ import annotations
+
+import numpy as np
+from typing import TYPE_CHECKING
+
+from battle import Battle
+from elements import EffectivenessCalculator, Element
+
+from data_structures.referential_array import ArrayR
+
+if TYPE_CHECKING:
+    from monster_base import MonsterBase
+    from team import MonsterTeam
+
+
+def monster_stats(monsters: ArrayR[MonsterBase]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns arrays of (hp, attack, defense, speed, element index) for the monsters,
+    using each monster's current level and stats mode.
+    O(n) - Where n is the number of monsters.
+    """
+    n = len(monsters)
+    stats = np.empty((5, n), dtype=np.int64)
+    for i in range(n):
+        monster = monsters[i]
+        stats[0, i] = monster.get_hp()
+        stats[1, i] = monster.get_attack()
+        stats[2, i] = monster.get_defense()
+        stats[3, i] = monster.get_speed()
+        stats[4, i] = Element.from_string(monster.get_element()).value - 1
+    return stats[0], stats[1], stats[2], stats[3], stats[4]
+
+
+def damage_matrix(attack: np.ndarray, attacker_elements: np.ndarray, defense: np.ndarray, defender_elements: np.ndarray) -> np.ndarray:
+    """
+    Returns the damage every attacker deals to every defender in one attack, batched over
+    every pairing. Uses the same formula as monster_base.attack_damage, the one battles use.
+    O(n * m) - Where n and m are the numbers of attackers and defenders.
+    """
+    effectiveness = EffectivenessCalculator.get_matrix()[np.ix_(attacker_elements, defender_elements)]
+    attack = attack[:, None].astype(np.float64)
+    defense = defense[None, :].astype(np.float64)
+    raw = np.where(
+        defense < attack / 2,
+        attack - defense,
+        np.where(defense < attack, attack * 5 / 8 - defense / 4, attack / 4),
+    )
+    return np.maximum(np.ceil(raw * effectiveness), 0).astype(np.int64)
+
+
+def turns_to_faint(damage: np.ndarray, hp: np.ndarray) -> np.ndarray:
+    """
+    Returns how many turns each pairing takes to faint the defender, counting the 1 HP both
+    monsters lose at the end of every turn.
+    O(n * m)
+    """
+    per_turn = damage + 1
+    return -(-hp[None, :] // per_turn) # Ceiling division
+
+
+class Matchup:
+    """Precomputed per-turn damage and turns-to-faint for every monster pairing of two teams."""
+
+    def __init__(self, team1: MonsterTeam, team2: MonsterTeam) -> None:
+        """
+        Best case: O(n * m)
+        Worst case: O(n * m) - Where n and m are the team sizes.
+        """
+        self.hp1, attack1, defense1, self.speed1, elements1 = monster_stats(team1.get_monsters())
+        self.hp2, attack2, defense2, self.speed2, elements2 = monster_stats(team2.get_monsters())
+        # Rows are always team 1's monsters, columns team 2's.
+        self.damage = damage_matrix(attack1, elements1, defense2, elements2)
+        self.damage_taken = damage_matrix(attack2, elements2, defense1, elements1).T
+        self.turns_to_faint = turns_to_faint(self.damage, self.hp2)
+        self.turns_to_be_fainted = turns_to_faint(self.damage_taken.T, self.hp1).T
+
+    def wins(self) -> np.ndarray:
+        """
+        Returns a matrix holding 1 where team 1's monster wins the pairing, -1 where it loses
+        and 0 for a draw.
+
+        When both monsters would faint on the same turn, that turn is played out as in a
+        battle: the faster monster attacks first, and wins if that attack alone faints the
+        other. Otherwise the slower monster wins if its attack faints the faster one. With
+        equal speeds both attack at once, and a monster wins if only its attack faints the
+        other. It is only a draw when both faint at once.
+        O(n * m)
+        """
+        outcome = np.sign(self.turns_to_be_fainted - self.turns_to_faint)
+        # HP each monster has left at the start of the last turn, where the turns are equal.
+        last = self.turns_to_faint - 1
+        left1 = self.hp1[:, None] - last * (self.damage_taken + 1)
+        left2 = self.hp2[None, :] - last * (self.damage + 1)
+        faints2 = left2 <= self.damage
+        faints1 = left1 <= self.damage_taken
+        faster = np.sign(self.speed1[:, None] - self.speed2[None, :])
+        tie = np.where(
+            faster > 0,
+            np.where(faints2, 1, -faints1.astype(np.int64)),
+            np.where(faster < 0, np.where(faints1, -1, faints2.astype(np.int64)), faints2.astype(np.int64) - faints1),
+        )
+        return np.where(outcome == 0, tie, outcome).astype(np.int64)
+
+    def estimate_result(self) -> Battle.Result:
+        """
+        Estimates the battle result from the share of pairings each team wins.
+        O(n * m)
+        """
+        score = self.wins().sum()
+        if score > 0:
+            return Battle.Result.TEAM1
+        elif score < 0:
+            return Battle.Result.TEAM2
+        return Battle.Result.DRAW
+
+
+def rank_opponents(team: MonsterTeam, opponents: ArrayR[MonsterTeam]) -> ArrayR[int]:
+    """
+    Returns the indices of `opponents`, ordered from the easiest to the hardest for `team`,
+    scored by the share of monster pairings `team` wins.
+    O(k * n * m) - Where k is the number of opponents.
+    """
+    scores = np.empty(len(opponents))
+    for i in range(len(opponents)):
+        scores[i] = Matchup(team, opponents[i]).wins().mean()
+    return ArrayR.from_list(np.argsort(-scores, kind="stable").tolist())
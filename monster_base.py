@@ -1,8 +1,27 @@
 from __future__ import annotations
 import abc
+import math
+from typing import Optional
 
+from elements import EffectivenessCalculator, Element
 from stats import Stats
 
+
+def attack_damage(attack: int, defense: int, effectiveness: float) -> int:
+    """
+    The HP lost by a monster with `defense` when attacked with `attack` at the given element effectiveness.
+    Shared by MonsterBase.attack, the fast battle engine and the matchup matrices, so they always agree.
+    Never negative, so a high defense can't heal the monster attacked.
+    O(1)
+    """
+    if defense < attack / 2:
+        damage = attack - defense
+    elif defense < attack:
+        damage = attack * 5 / 8 - defense / 4
+    else:
+        damage = attack / 4
+    return max(math.ceil(damage * effectiveness), 0)
+
 class MonsterBase(abc.ABC):
 
     def __init__(self, simple_mode=True, level:int=1) -> None:
@@ -50,13 +69,27 @@ class MonsterBase(abc.ABC):
         """Whether the current monster instance is alive (HP > 0 )"""
         raise NotImplementedError
 
-    def attack(self, other: MonsterBase):
-        """Attack another monster instance"""
+    def damage_against(self, other: MonsterBase, calculator: Optional[EffectivenessCalculator] = None) -> int:
+        """
+        The HP `other` loses when this monster instance attacks it, with the effectiveness from
+        `calculator`, or the current EffectivenessCalculator if not given.
+        O(n) - Where n is the number of elements.
+        """
+        if calculator is None:
+            calculator = EffectivenessCalculator.instance
+        effectiveness = calculator.effectiveness(
+            Element.from_string(self.get_element()),
+            Element.from_string(other.get_element()),
+        )
+        return attack_damage(self.get_attack(), other.get_defense(), effectiveness)
+
+    def attack(self, other: MonsterBase, calculator: Optional[EffectivenessCalculator] = None):
+        """Attack another monster instance, see damage_against"""
         # Step 1: Compute attack stat vs. defense stat
         # Step 2: Apply type effectiveness
         # Step 3: Ceil to int
         # Step 4: Lose HP
-        raise NotImplementedError
+        other.set_hp(other.get_hp() - self.damage_against(other, calculator))
 
     def ready_to_evolve(self) -> bool:
         """Whether this monster is ready to evolve. See assignment spec for specific logic."""
@@ -4,12 +4,137 @@ Random number generator class. Uses LCG method with some reasonable initialisati
 __author__ = "Jackson Goerner"
 
 import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from data_structures.referential_array import ArrayR
+
+class RandomStream():
+    """
+    A single, independently seeded stream of random numbers.
+
+    Uses the same LCG as RandomGen. All methods are O(1) best/worst case time complexity unless stated otherwise.
+
+    Usage:
+    ```
+    stream = RandomStream(123)
+    stream.randint(1, 10)        # Random number from 1 to 10
+    child = stream.split()       # Independent stream, for another team/battle/thread
+    stream.jump(1000)            # Skip the next 1000 numbers
+    ```
+    """
+
+    MOD = pow(2, 48)
+    A = 25214903917
+    C = 11
+
+    # How far a stream jumps ahead when it is split, so parent and child never overlap
+    # unless the child draws more than this many numbers.
+    SPLIT_DISTANCE = 1 << 32
+
+    def __init__(self, seed=None) -> None:
+        self.set_seed(seed)
+
+    def set_seed(self, seed=None):
+        """Seed all future calls to `random`."""
+        self.seed = time.time_ns() if seed is None else seed
+
+    def random(self):
+        """Returns a random integer from 0 to 2^32-1"""
+        self.seed = (self.A * self.seed + self.C) % self.MOD
+        return self.seed >> 16
+
+    def random_float(self):
+        """Returns a random floating point integer in the range 0 to 1."""
+        return self.random() / (1 << 32)
+
+    def random_block(self, n: int) -> ArrayR[int]:
+        """
+        Returns an ArrayR of the next n results of `random`, in order.
+        :complexity: O(n), with the LCG state held in local variables
+        """
+        seed, a, c = self.seed, self.A, self.C
+        mask = self.MOD - 1 # MOD is a power of two
+        values = [0] * n
+        for i in range(n):
+            seed = (a * seed + c) & mask
+            values[i] = seed >> 16
+        self.seed = seed
+        block = ArrayR(n)
+        block.array[:] = values
+        return block
+
+    def randint_block(self, lo: int, hi: int, n: int) -> ArrayR[int]:
+        """
+        Returns an ArrayR of the next n results of `randint(lo, hi)`, in order.
+        :complexity: O(n)
+        """
+        seed, a, c = self.seed, self.A, self.C
+        mask = self.MOD - 1
+        span = hi - lo + 1
+        values = [0] * n
+        for i in range(n):
+            seed = (a * seed + c) & mask
+            values[i] = ((seed >> 16) % span) + lo
+        self.seed = seed
+        block = ArrayR(n)
+        block.array[:] = values
+        return block
+
+    def randint(self, lo, hi):
+        """Returns a random integer from `lo` to `hi` inclusive on both ends."""
+        return (self.random() % (hi - lo + 1)) + lo
+
+    def random_chance(self, ratio):
+        """Returns random()/2^32 < ratio"""
+        return self.random_float() < ratio
+
+    def random_choice(self, collection):
+        """Returns a random choice from a collection that supports __getitem__ and __len__"""
+        return collection[self.randint(0, len(collection)-1)]
+
+    def random_shuffle(self, collection) -> None:
+        """
+        Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__
+        :complexity: O(len(collection))
+        """
+        positions = [(self.random(), i) for i in range(len(collection))]
+        positions.sort() # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
+        tmp = [collection[p[1]] for p in positions]
+        for x in range(len(collection)):
+            collection[x] = tmp[x]
+
+    def jump(self, steps: int) -> None:
+        """
+        Advances the stream as if `random` had been called `steps` times.
+        :complexity: O(log(steps)), by repeatedly squaring the LCG step x -> A * x + C
+        """
+        mul, add = 1, 0
+        step_mul, step_add = self.A, self.C
+        while steps > 0:
+            if steps & 1:
+                mul, add = (mul * step_mul) % self.MOD, (add * step_mul + step_add) % self.MOD
+            step_mul, step_add = (step_mul * step_mul) % self.MOD, (step_add * (step_mul + 1)) % self.MOD
+            steps >>= 1
+        self.seed = (mul * self.seed + add) % self.MOD
+
+    def split(self):
+        """
+        Returns a new stream continuing from the current state, and jumps this stream
+        SPLIT_DISTANCE numbers ahead so the two do not overlap.
+        :complexity: O(log(SPLIT_DISTANCE))
+        """
+        child = RandomStream(self.seed)
+        self.jump(self.SPLIT_DISTANCE)
+        return child
 
 class RandomGen():
     """
     Class used to generate (seeded) random numbers for interesting outcomes and repeatable tests.
 
     Uses LCG method. All methods are O(1) best/worst case time complexity unless stated otherwise.
+    The classmethods all draw from the shared default stream, `RandomGen.stream`.
+    Anything accepting a stream can be given either RandomGen itself or a RandomStream.
 
     Usage:
     ```
@@ -17,46 +142,64 @@ class RandomGen():
     RandomGen.random()           # Random number from 0 to 2^32-1
     RandomGen.randint(1, 10)     # Random number from 1 to 10
     RandomGen.random_chance(0.33) # True 33% of the time, False 67% of the time.
+    RandomGen.randint_block(1, 10, 5) # ArrayR of 5 random numbers from 1 to 10
+    RandomGen.split()            # A RandomStream independent of the default stream
+    with RandomGen.using(stream): # The classmethods draw from stream until the block ends
+        ...
     ```
     """
 
-    MOD = pow(2, 48)
-    A = 25214903917
-    C = 11
+    MOD = RandomStream.MOD
+    A = RandomStream.A
+    C = RandomStream.C
 
-    seed = time.time_ns()
+    stream = RandomStream()
 
     @classmethod
     def set_seed(cls, seed=None):
         """Seed all future calls to `random`."""
-        seed = time.time_ns() if seed is None else seed
-        cls.seed = seed
+        cls.stream.set_seed(seed)
 
     @classmethod
     def random(cls):
         """Returns a random integer from 0 to 2^32-1"""
-        cls.seed = (cls.A * cls.seed + cls.C) % cls.MOD
-        return cls.seed >> 16
+        return cls.stream.random()
 
     @classmethod
     def random_float(cls):
         """Returns a random floating point integer in the range 0 to 1."""
-        return cls.random() / (1 << 32)
+        return cls.stream.random_float()
 
     @classmethod
     def randint(cls, lo, hi):
         """Returns a random integer from `lo` to `hi` inclusive on both ends."""
-        return (cls.random() % (hi - lo + 1)) + lo
+        return cls.stream.randint(lo, hi)
+
+    @classmethod
+    def random_block(cls, n):
+        """
+        Returns an ArrayR of the next n results of `random`.
+        :complexity: O(n)
+        """
+        return cls.stream.random_block(n)
+
+    @classmethod
+    def randint_block(cls, lo, hi, n):
+        """
+        Returns an ArrayR of the next n results of `randint(lo, hi)`.
+        :complexity: O(n)
+        """
+        return cls.stream.randint_block(lo, hi, n)
 
     @classmethod
     def random_chance(cls, ratio):
         """Returns random()/2^32 < ratio"""
-        return cls.random_float() < ratio
+        return cls.stream.random_chance(ratio)
 
     @classmethod
     def random_choice(cls, collection) -> None:
         """Returns a random choice from a collection that supports __getitem__ and __len__"""
-        return collection[cls.randint(0, len(collection)-1)]
+        return cls.stream.random_choice(collection)
 
     @classmethod
     def random_shuffle(cls, collection) -> None:
@@ -64,8 +207,35 @@ class RandomGen():
         Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__
         :complexity: O(len(collection))
         """
-        positions = [(RandomGen.random(), i) for i in range(len(collection))]
-        positions.sort() # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
-        tmp = [collection[p[1]] for p in positions]
-        for x in range(len(collection)):
-            collection[x] = tmp[x]
+        cls.stream.random_shuffle(collection)
+
+    @classmethod
+    def jump(cls, steps: int) -> None:
+        """
+        Advances the default stream by `steps` numbers.
+        :complexity: O(log(steps))
+        """
+        cls.stream.jump(steps)
+
+    @classmethod
+    def split(cls) -> RandomStream:
+        """
+        Returns a new stream split off the default stream.
+        :complexity: O(log(RandomStream.SPLIT_DISTANCE))
+        """
+        return cls.stream.split()
+
+    @classmethod
+    @contextmanager
+    def using(cls, stream: RandomStream) -> Iterator[RandomStream]:
+        """
+        Makes `stream` the default stream for the duration of a with block, then puts the
+        previous one back, even if the block raises. Code that draws from RandomGen, such as
+        a team spec callable run in a worker, then draws from `stream` instead.
+        :complexity: O(1)
+        """
+        previous, cls.stream = cls.stream, stream
+        try:
+            yield stream
+        finally:
+            cls.stream = previous
@@ -0,0 +1,212 @@
+"""
+Monte Carlo battle simulation across a process pool.
+
+Battles are split into fixed size chunks, and each chunk is given its own seed drawn
+from RandomGen, so the aggregate only depends on the RandomGen seed and never on the
+number of workers or the order chunks finish in. Each chunk runs on its own RandomStream,
+so RandomGen is left in the same state whatever the number of workers.
+
+Usage:
+```
+RandomGen.set_seed(123)
+result = simulate_many(
+    {"team_mode": MonsterTeam.TeamMode.BACK, "selection_mode": MonsterTeam.SelectionMode.RANDOM},
+    {"team_mode": MonsterTeam.TeamMode.FRONT, "provided_monsters": ["Flamikin", "Vineon"]},
+    n=10000,
+    workers=4,
+)
+print(result.team1_wins, result.team2_wins, result.draws)
+```
+"""
+from __future__ import annotations
+
+import argparse
+from multiprocessing import Pool
+from typing import Callable, Iterator, Optional, Union
+
+from battle import Battle
+from random_gen import RandomGen, RandomStream
+from team import MonsterTeam
+
+from data_structures.referential_array import ArrayR
+
+# Either MonsterTeam keyword arguments, with provided_monsters given as monster names,
+# or a picklable callable returning a fresh MonsterTeam.
+TeamSpec = Union[dict, Callable[[], MonsterTeam]]
+
+CHUNK_SIZE = 250
+
+
+class SimulationResult:
+    """Aggregated outcome of many battles."""
+
+    def __init__(self) -> None:
+        self.team1_wins = 0
+        self.team2_wins = 0
+        self.draws = 0
+        self.turn_histogram: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """The number of battles recorded. O(1)"""
+        return self.team1_wins + self.team2_wins + self.draws
+
+    def record(self, result: Battle.Result, turns: int) -> None:
+        """O(1)"""
+        if result == Battle.Result.TEAM1:
+            self.team1_wins += 1
+        elif result == Battle.Result.TEAM2:
+            self.team2_wins += 1
+        else:
+            self.draws += 1
+        self.turn_histogram[turns] = self.turn_histogram.get(turns, 0) + 1
+
+    def merge(self, other: SimulationResult) -> None:
+        """
+        Adds the battles of another result to this one.
+        O(k) - Where k is the number of distinct turn counts in other.
+        """
+        self.team1_wins += other.team1_wins
+        self.team2_wins += other.team2_wins
+        self.draws += other.draws
+        for turns, count in other.turn_histogram.items():
+            self.turn_histogram[turns] = self.turn_histogram.get(turns, 0) + count
+
+    def copy(self) -> SimulationResult:
+        """
+        Returns an independent copy of this result.
+        O(k) - Where k is the number of distinct turn counts.
+        """
+        result = SimulationResult()
+        result.merge(self)
+        return result
+
+    def __str__(self) -> str:
+        return f"Team 1: {self.team1_wins}, Team 2: {self.team2_wins}, Draws: {self.draws}"
+
+
+def build_team(spec: TeamSpec, stream: Optional[RandomStream] = None) -> MonsterTeam:
+    """
+    Creates a fresh team from a team spec. Random teams from a dict spec draw from stream,
+    if given, rather than from RandomGen.
+    O(n) - Where n is the size of the team.
+    """
+    if callable(spec):
+        return spec()
+    kwargs = dict(spec)
+    if stream is not None:
+        kwargs.setdefault("stream", stream)
+    kwargs.setdefault("team_mode", MonsterTeam.TeamMode.BACK)
+    if "provided_monsters" in kwargs:
+        import helpers
+        names = kwargs["provided_monsters"]
+        kwargs["provided_monsters"] = ArrayR.from_list([getattr(helpers, name) for name in names])
+        kwargs.setdefault("selection_mode", MonsterTeam.SelectionMode.PROVIDED)
+    kwargs.setdefault("selection_mode", MonsterTeam.SelectionMode.RANDOM)
+    return MonsterTeam(**kwargs)
+
+
+def _run_chunk(args: tuple[TeamSpec, TeamSpec, int, int]) -> SimulationResult:
+    """
+    Runs a chunk of battles on a stream of its own, seeded with the chunk's seed.
+    O(k * t) - Where k is the number of battles and t the turns per battle.
+    """
+    spec1, spec2, count, seed = args
+    with RandomGen.using(RandomStream(seed)) as stream:
+        battle = Battle(verbosity=0, fast=True)
+        result = SimulationResult()
+        for _ in range(count):
+            outcome = battle.battle(build_team(spec1, stream), build_team(spec2, stream))
+            result.record(outcome, battle.turn_number)
+    return result
+
+
+def _chunks(spec1: TeamSpec, spec2: TeamSpec, n: int, chunk_size: int) -> list[tuple[TeamSpec, TeamSpec, int, int]]:
+    """Splits n battles into chunks, each with a seed drawn from RandomGen. O(n / chunk_size)"""
+    chunks = []
+    for start in range(0, n, chunk_size):
+        chunks.append((spec1, spec2, min(chunk_size, n - start), RandomGen.random()))
+    return chunks
+
+
+def simulate_stream(
+    team_spec1: TeamSpec,
+    team_spec2: TeamSpec,
+    n: int,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[SimulationResult]:
+    """
+    Runs n battles and yields the running totals each time a chunk finishes, each as a
+    copy that later chunks won't change. With workers=1 the battles are run in this process.
+
+    Best case: O(n * t / workers)
+    Worst case: O(n * t / workers) - Where t is the number of turns per battle.
+    """
+    chunks = _chunks(team_spec1, team_spec2, n, chunk_size)
+    total = SimulationResult()
+    if workers <= 1:
+        for chunk in chunks:
+            total.merge(_run_chunk(chunk))
+            yield total.copy()
+        return
+    with Pool(workers) as pool:
+        for partial in pool.imap_unordered(_run_chunk, chunks):
+            total.merge(partial)
+            yield total.copy()
+
+
+def simulate_many(
+    team_spec1: TeamSpec,
+    team_spec2: TeamSpec,
+    n: int,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> SimulationResult:
+    """
+    Runs n battles between teams built from the two specs and returns the totals.
+
+    Best case: O(n * t / workers)
+    Worst case: O(n * t / workers) - Where t is the number of turns per battle.
+    """
+    total = SimulationResult()
+    for total in simulate_stream(team_spec1, team_spec2, n, workers, chunk_size):
+        pass
+    return total
+
+
+def _team_spec_from_args(monsters: str, mode: str, sort: Optional[str]) -> dict:
+    spec = {"team_mode": MonsterTeam.TeamMode[mode]}
+    if sort is not None:
+        spec["sort_key"] = MonsterTeam.SortMode[sort]
+    if monsters:
+        spec["provided_monsters"] = monsters.split(",")
+    return spec
+
+
+if __name__ == "__main__":
+    modes = [mode.name for mode in MonsterTeam.TeamMode]
+    sorts = [sort.name for sort in MonsterTeam.SortMode]
+    p = argparse.ArgumentParser(description="Estimate win rates by simulating many battles.")
+    p.add_argument("-n", type=int, default=1000, help="Number of battles to run.")
+    p.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes.")
+    p.add_argument("-s", "--seed", type=int, default=None, help="Seed for RandomGen.")
+    p.add_argument("--team1", default="", help="Comma separated monster names. Random if blank.")
+    p.add_argument("--team2", default="", help="Comma separated monster names. Random if blank.")
+    p.add_argument("--mode1", default="BACK", type=str.upper, choices=modes, help="Team mode of team 1.")
+    p.add_argument("--mode2", default="BACK", type=str.upper, choices=modes, help="Team mode of team 2.")
+    p.add_argument("--sort1", default=None, type=str.upper, choices=sorts, help="Sort key of team 1, for OPTIMISE.")
+    p.add_argument("--sort2", default=None, type=str.upper, choices=sorts, help="Sort key of team 2, for OPTIMISE.")
+    args = p.parse_args()
+    for team in ("1", "2"):
+        if getattr(args, "mode" + team) == "OPTIMISE" and getattr(args, "sort" + team) is None:
+            p.error(f"--sort{team} is required with --mode{team} OPTIMISE.")
+
+    RandomGen.set_seed(args.seed)
+    spec1 = _team_spec_from_args(args.team1, args.mode1, args.sort1)
+    spec2 = _team_spec_from_args(args.team2, args.mode2, args.sort2)
+    total = SimulationResult()
+    for total in simulate_stream(spec1, spec2, args.n, args.workers):
+        print(f"{len(total)}/{args.n} battles - {total}")
+    print("Turns:")
+    for turns in sorted(total.turn_histogram):
+        print(f"{turns}: {total.turn_histogram[turns]}")
@@ -0,0 +1,94 @@
+"""
+Batch evaluation of ComplexStats formulas over many levels at once, using NumPy.
+
+Usage:
+```
+levels = numpy.arange(1, 101)
+curves = stat_curves(get_all_monsters(), levels)
+curves["attack"]    # Matrix of shape (100, number of species)
+```
+"""
+from __future__ import annotations
+
+import numpy as np
+from typing import TYPE_CHECKING
+
+from data_structures.referential_array import ArrayR
+
+if TYPE_CHECKING:
+    from monster_base import MonsterBase
+
+STAT_NAMES = ("attack", "defense", "speed", "max_hp")
+
+_BINARY_OPERATORS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.true_divide,
+    'power': np.power,
+}
+
+def evaluate_levels(expression: ArrayR[str], levels) -> np.ndarray:
+    """
+    Evaluates an RPN expression for every level in `levels` at once.
+    Follows ComplexStats.evaluate_expression: binary operators and the final result are
+    truncated towards zero. Invalid operations (such as dividing by zero) raise FloatingPointError.
+
+    Best case: O(N * L)
+    Worst case: O(N * L) - Where N is the number of tokens and L the number of levels,
+    but each token is a single NumPy operation over all levels.
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    stack = []
+
+    with np.errstate(divide='raise', invalid='raise', over='raise'):
+        for token in expression:
+            if token in _BINARY_OPERATORS:
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(np.trunc(_BINARY_OPERATORS[token](a, b)))
+            elif token == 'sqrt':
+                stack.append(np.sqrt(stack.pop()))
+            elif token == 'level':
+                stack.append(levels)
+            elif token == 'middle':
+                c = stack.pop()
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(np.maximum(np.minimum(a, b), np.minimum(np.maximum(a, b), c)))
+            else:
+                stack.append(np.float64(token))
+
+        result = np.trunc(stack[0])
+    # Constant formulas evaluate to a scalar, so spread them over every level.
+    return np.broadcast_to(result, levels.shape).astype(np.int64)
+
+def stat_matrix(monsters: ArrayR[type[MonsterBase]], levels, stat: str) -> np.ndarray:
+    """
+    Returns a matrix of shape (len(levels), len(monsters)) holding the complex `stat`
+    of every monster class at every level.
+
+    Best case: O(M * N * L)
+    Worst case: O(M * N * L) - Where M is the number of monster classes.
+    """
+    levels = np.asarray(levels)
+    matrix = np.empty((len(levels), len(monsters)), dtype=np.int64)
+    for column in range(len(monsters)):
+        formula = getattr(monsters[column].get_complex_stats(), stat + "_formula")
+        matrix[:, column] = evaluate_levels(formula, levels)
+    return matrix
+
+def stat_curves(monsters: ArrayR[type[MonsterBase]], levels) -> dict[str, np.ndarray]:
+    """
+    Returns a levels x species matrix for each of attack, defense, speed and max_hp.
+
+    Best case: O(M * N * L)
+    Worst case: O(M * N * L)
+    """
+    return {stat: stat_matrix(monsters, levels, stat) for stat in STAT_NAMES}
+
+if __name__ == "__main__":
+    from helpers import get_all_monsters
+    curves = stat_curves(get_all_monsters(), np.arange(1, 11))
+    for stat in STAT_NAMES:
+        print(stat, curves[stat][:, :5].tolist())
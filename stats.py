@@ -1,5 +1,8 @@
+from __future__ import annotations
 import abc
 import math
+import operator
+from collections import OrderedDict
 
 from data_structures.referential_array import ArrayR
 
@@ -43,21 +46,33 @@ class SimpleStats(Stats):
 
 class ComplexStats(Stats):
 
+    CACHE_MAX_LEVEL = 100
+    OVERFLOW_CAPACITY = 64
+
     def __init__(
         self,
         attack_formula: ArrayR[str],
         defense_formula: ArrayR[str],
         speed_formula: ArrayR[str],
         max_hp_formula: ArrayR[str],
+        cache_max_level: int | None = None,
     ) -> None:
         """
         This method has a complexity of O(N), where N relates to the size of each respective array.
+
+        Stat values are memoised per level: levels 0 to cache_max_level are kept in a table,
+        higher levels in an LRU of at most OVERFLOW_CAPACITY entries.
         """
         self.attack_formula = attack_formula
         self.defense_formula = defense_formula
         self.speed_formula = speed_formula
         self.max_hp_formula = max_hp_formula
-        pass
+        self.cache_max_level = self.CACHE_MAX_LEVEL if cache_max_level is None else cache_max_level
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._compiled = {} # Stat name -> compiled formula, filled on first use
+        self._tables = {} # Stat name -> ArrayR indexed by level, filled lazily
+        self._overflow = OrderedDict() # (stat name, level) -> value, for levels past the table
 
     def evaluate_expression(self, expression, level):
         """
@@ -95,14 +110,135 @@ class ComplexStats(Stats):
 
         return int(stack[0])
 
+    @staticmethod
+    def compile_expression(expression):
+        """
+        Compiles an RPN expression into a callable taking the level, with the same
+        results as evaluate_expression (binary operators truncate to int).
+        Subtrees that do not depend on the level are folded into constants.
+
+        Best case: O(N)
+        Worst case: O(N) - Each token is processed exactly once.
+        Calling the result is O(N) in the worst case, but only performs arithmetic.
+        """
+        stack = [] # Holds (is_constant, value_or_callable) pairs
+
+        for token in expression:
+            if token in _BINARY_OPERATORS:
+                op = _BINARY_OPERATORS[token]
+                const_b, b = stack.pop()
+                const_a, a = stack.pop()
+                if const_a and const_b:
+                    stack.append((True, int(op(a, b))))
+                elif const_a:
+                    stack.append((False, lambda level, a=a, b=b, op=op: int(op(a, b(level)))))
+                elif const_b:
+                    stack.append((False, lambda level, a=a, b=b, op=op: int(op(a(level), b))))
+                else:
+                    stack.append((False, lambda level, a=a, b=b, op=op: int(op(a(level), b(level)))))
+            elif token == 'sqrt':
+                const_a, a = stack.pop()
+                if const_a:
+                    stack.append((True, math.sqrt(a)))
+                else:
+                    stack.append((False, lambda level, a=a: math.sqrt(a(level))))
+            elif token == 'level':
+                stack.append((False, _identity))
+            elif token == 'middle':
+                args = (stack.pop(), stack.pop(), stack.pop())[::-1]
+                if all(const for const, _ in args):
+                    stack.append((True, sorted([value for _, value in args])[1]))
+                else:
+                    fns = tuple(value if not const else (lambda level, value=value: value) for const, value in args)
+                    stack.append((False, lambda level, fns=fns: _middle(fns[0](level), fns[1](level), fns[2](level))))
+            else:
+                stack.append((True, float(token)))
+
+        const, value = stack[0]
+        if const:
+            result = int(value)
+            return lambda level: result
+        return lambda level: int(value(level))
+
+    def cache_info(self) -> tuple[int, int]:
+        """Returns (hits, misses) of the per-level cache. O(1)"""
+        return self.cache_hits, self.cache_misses
+
+    def clear_cache(self) -> None:
+        """
+        Best case: O(1)
+        Worst case: O(1) - The tables are dropped and reallocated lazily.
+        """
+        self._tables = {}
+        self._overflow = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _get_stat(self, name: str, level: int) -> int:
+        """
+        Best case: O(1) - The level has been computed before.
+        Worst case: O(N) - The formula has to be compiled, where N is its number of tokens.
+        """
+        if 0 <= level <= self.cache_max_level:
+            table = self._tables.get(name)
+            if table is None:
+                table = ArrayR(self.cache_max_level + 1)
+                self._tables[name] = table
+            value = table[level]
+            if value is not None:
+                self.cache_hits += 1
+                return value
+            self.cache_misses += 1
+            value = self._evaluate(name, level)
+            table[level] = value
+            return value
+
+        key = (name, level)
+        if key in self._overflow:
+            self.cache_hits += 1
+            self._overflow.move_to_end(key)
+            return self._overflow[key]
+        self.cache_misses += 1
+        value = self._evaluate(name, level)
+        self._overflow[key] = value
+        if len(self._overflow) > self.OVERFLOW_CAPACITY:
+            self._overflow.popitem(last=False) # Evicts the least recently used level
+        return value
+
+    def _evaluate(self, name: str, level: int) -> int:
+        fn = self._compiled.get(name)
+        if fn is None:
+            fn = self.compile_expression(getattr(self, name + "_formula"))
+            self._compiled[name] = fn
+        return fn(level)
+
     def get_attack(self, level: int):
-        return self.evaluate_expression(self.attack_formula, level) # Utilizes formulas derived from evaluate_expression function
+        return self._get_stat("attack", level) # Utilizes formulas compiled from compile_expression
 
     def get_defense(self, level: int):
-        return self.evaluate_expression(self.defense_formula, level)
+        return self._get_stat("defense", level)
 
     def get_speed(self, level: int):
-        return self.evaluate_expression(self.speed_formula, level)
+        return self._get_stat("speed", level)
 
     def get_max_hp(self, level: int):
-        return self.evaluate_expression(self.max_hp_formula, level)
+        return self._get_stat("max_hp", level)
+
+def _identity(level):
+    return level
+
+def _middle(a, b, c):
+    """Median of three values without building a list. O(1)"""
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b = c
+    return a if a > b else b
+
+_BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    'power': math.pow,
+}
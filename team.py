@@ -1,17 +1,37 @@
 from __future__ import annotations
+from array import array
 from enum import auto
 from typing import Optional, TYPE_CHECKING
 
 from base_enum import BaseEnum
 from monster_base import MonsterBase
-from random_gen import RandomGen
-from helpers import get_all_monsters
+from random_gen import RandomGen, RandomStream
+from helpers import get_all_monsters, get_spawnable_monsters
+from team_modes import FrontStrategy, BackStrategy, OptimiseStrategy
 
 from data_structures.referential_array import ArrayR
 
 if TYPE_CHECKING:
     from battle import Battle
 
+class TeamSnapshot:
+    """
+    The order and state of a team's monsters, taken by MonsterTeam.snapshot().
+    HP and levels are stored in typed arrays, in the same order as monsters.
+    """
+
+    __slots__ = ("monsters", "hps", "levels", "state")
+
+    def __init__(self, monsters: ArrayR[MonsterBase], hps: array, levels: array, state) -> None:
+        self.monsters = monsters
+        self.hps = hps
+        self.levels = levels
+        self.state = state
+
+    def __len__(self) -> int:
+        """O(1)"""
+        return len(self.hps)
+
 class MonsterTeam:
 
     class TeamMode(BaseEnum):
@@ -34,18 +54,54 @@ class MonsterTeam:
         SPEED = auto()
         LEVEL = auto()
 
+    # The default team limit, and the storage strategies allocate up front for larger limits.
     TEAM_LIMIT = 6
 
-    def __init__(self, team_mode: TeamMode, selection_mode, **kwargs) -> None:
+    # The strategy implementing each team mode. See team_modes.py.
+    STRATEGIES = {
+        TeamMode.FRONT: FrontStrategy,
+        TeamMode.BACK: BackStrategy,
+        TeamMode.OPTIMISE: OptimiseStrategy,
+    }
+
+    def __init__(
+        self,
+        team_mode: TeamMode,
+        selection_mode,
+        stream: RandomStream | type[RandomGen] = RandomGen,
+        sort_key: Optional[SortMode] = None,
+        team_limit: Optional[int] = None,
+        **kwargs,
+    ) -> None:
         """
         Best case: O(n)
         Worst case: O(n) - Dependent of the size of monsters in the team created
+
+        :stream: Where random numbers are drawn from. Defaults to the shared RandomGen stream.
+        :sort_key: The stat monsters are sorted by in OPTIMISE mode.
+        :team_limit: The most monsters the team can hold. Defaults to TEAM_LIMIT.
+            Storage starts at TEAM_LIMIT slots and doubles as needed, up to team_limit.
         """
+        if team_mode not in self.STRATEGIES:
+            raise ValueError(f"team_mode {team_mode} not supported.")
+        if team_mode == self.TeamMode.OPTIMISE and sort_key is None:
+            raise ValueError("sort_key is required in OPTIMISE mode.")
+        if team_limit is None:
+            team_limit = self.TEAM_LIMIT
+        elif team_limit < 1:
+            raise ValueError(f"team_limit must be at least 1, not {team_limit}.")
+        self.team_limit = team_limit
         self.team_mode = team_mode
-        self.team = ArrayR[Optional[MonsterBase]](self.TEAM_LIMIT)
+        self.sort_key = sort_key
+        self.stream = stream
         self.team_size = 0
+        # Bind the mode's implementations once, rather than branching on every call.
+        self.strategy = self.STRATEGIES[team_mode](self)
+        self._add = self.strategy.add
+        self._retrieve = self.strategy.retrieve
+        self._special = self.strategy.special
         if selection_mode == self.SelectionMode.RANDOM:
-            self.select_randomly
+            self.select_randomly()
         elif selection_mode == self.SelectionMode.MANUAL:
             self.select_manually
         elif selection_mode == self.SelectionMode.PROVIDED:
@@ -55,38 +111,22 @@ class MonsterTeam:
 
     def add_to_team(self, monster: MonsterBase):
         """
-        Best case: O(1) - When the monster is inserted without any shifting.
-        Worst case: O(n) - When shifting is involved in insertion.
+        Best case: O(1) - FRONT and BACK push onto a deque, amortised over its growth.
+        Worst case: O(log n) - OPTIMISE adds to a heap.
         """
-        if self.team_size < self.TEAM_LIMIT:
-            if self.team_mode == self.TeamMode.FRONT:
-                self.team.insert_first(monster)
-            elif self.team_mode == self.TeamMode.BACK:
-                self.team.insert_last(monster)
-            elif self.team_mode == self.TeamMode.OPTIMISE:
-                stat_value = monster.get_stat(self.sort_key)
-                index = self.team_size
-                while index > 0 and self.team[index - 1].get_stat(self.sort_key) < stat_value:
-                    self.team[index] = self.team[index - 1]
-                    index -= 1
-                self.team[index] = monster
+        if self.team_size < self.team_limit:
+            self._add(monster)
             self.team_size += 1
         else:
             raise ValueError("Team is already full.")
 
     def retrieve_from_team(self) -> MonsterBase:
         """
-        Best case: O(1)
-        Worst case: O(1) - Since there is a set of instructions based on every possible scenario
-        It directly accesses an element from the given array.
+        Best case: O(1) - FRONT and BACK serve from a deque.
+        Worst case: O(log n) - OPTIMISE pops from its heap.
         """
         if self.team_size > 0:
-            if self.team_mode == self.TeamMode.FRONT:
-                monster = self.team.get_first()
-            elif self.team_mode == self.TeamMode.BACK:
-                monster = self.team.get_last()
-            elif self.team_mode == self.TeamMode.OPTIMISE:
-                monster = self.team[self.team_size - 1]
+            monster = self._retrieve()
             self.team_size -= 1
             return monster
         else:
@@ -94,56 +134,31 @@ class MonsterTeam:
 
     def special(self) -> None:
         """
-        Best case: O(n)
-        Worst case: O(n) - Where n is dependent on the team's size
-        O(n) is required due to the nature of operations performed and permuations involved.
+        Best case: O(1)
+        Worst case: O(1) - Every mode reorders by flags and a constant number of moves. See team_modes.py.
         """
-        if self.team_mode == self.TeamMode.FRONT:
-            self.team.reverse_first_n(3)
-        elif self.team_mode == self.TeamMode.BACK:
-            middle = self.team_size // 2
-            self.team.swap_first_half_with_second_half(middle)
-            self.team.reverse_last_n(middle)
-        elif self.team_mode == self.TeamMode.OPTIMISE:
-            self.team.reverse()
-        else:
-            raise ValueError("Invalid team mode.")
+        self._special()
 
     def regenerate_team(self) -> None:
         """
-        Best case: O(1)
-        Worst case: O(1) - Simply creates a new empty team
+        Best case: O(1) - When the team is already empty.
+        Worst case: O(n) - Every slot in use is cleared. The storage is kept for the next team.
         """
-        self.team = ArrayR[Optional[MonsterBase]](self.TEAM_LIMIT)
+        self.strategy.clear()
         self.team_size = 0
 
     def select_randomly(self):
         """
         Best case: O(n)
-        Worst case: O(n)
-        In this case, it is not possible for the best case complexity to be O(1).
-        It is required for the algorithm to iterate through every element in the list.
-        This is in order to count the amount of spawnable monsters, resulting in O(n) complexity.
+        Worst case: O(n) - Where n is the team size.
+        Spawnable monsters are indexed once by helpers, so each slot is an O(1) lookup.
         """
-        team_size = RandomGen.randint(1, self.TEAM_LIMIT)
-        monsters = get_all_monsters()
-        n_spawnable = 0
-        for x in range(len(monsters)):
-            if monsters[x].can_be_spawned():
-                n_spawnable += 1
-
-        for _ in range(team_size):
-            spawner_index = RandomGen.randint(0, n_spawnable-1)
-            cur_index = -1
-            for x in range(len(monsters)):
-                if monsters[x].can_be_spawned():
-                    cur_index += 1
-                    if cur_index == spawner_index:
-                        # Spawn this monster
-                        self.add_to_team(monsters[x]())
-                        break
-            else:
-                raise ValueError("Spawning logic failed.")
+        team_size = self.stream.randint(1, self.team_limit)
+        spawnable = get_spawnable_monsters()
+        spawner_indices = self.stream.randint_block(0, len(spawnable)-1, team_size)
+        for i in range(team_size):
+            # Spawn this monster
+            self.add_to_team(spawnable[spawner_indices[i]]())
 
     def select_manually(self):
         """
@@ -302,6 +317,47 @@ class MonsterTeam:
         for monster_class in provided_monsters:
             self.add_to_team(monster_class())
 
+    def snapshot(self) -> TeamSnapshot:
+        """
+        Records the team's monsters, in order, with their HP and levels, for restore().
+        Best case: O(n)
+        Worst case: O(n log n) - OPTIMISE lists its monsters by draining a copy of its heap.
+        """
+        monsters = self.get_monsters()
+        hps = array("q")
+        levels = array("q")
+        for i in range(len(monsters)):
+            hps.append(monsters[i].get_hp())
+            levels.append(monsters[i].get_level())
+        return TeamSnapshot(monsters, hps, levels, self.strategy.save())
+
+    def restore(self, snapshot: TeamSnapshot) -> None:
+        """
+        Puts the team back as it was when `snapshot` was taken: the same monsters, in the
+        same order, at the same HP and levels. Monsters are reused rather than rebuilt, so a
+        team can be restored before every battle.
+
+        MonsterBase can only level up, so a monster whose level has changed since the
+        snapshot is replaced with a new instance of its class at the old level, built with
+        the default stats mode as teams always build their monsters.
+        Best case: O(n) - When no monster has levelled up.
+        Worst case: O(n log n) - OPTIMISE rebuilds its heap. Where n is the size of the team in the snapshot.
+        """
+        monsters = snapshot.monsters
+        for i in range(len(snapshot)):
+            if monsters[i].get_level() != snapshot.levels[i]:
+                monsters[i] = type(monsters[i])(level=snapshot.levels[i])
+            monsters[i].set_hp(snapshot.hps[i])
+        self.strategy.restore(monsters, snapshot.state)
+        self.team_size = len(snapshot)
+
+    def get_monsters(self) -> ArrayR[MonsterBase]:
+        """
+        Returns the monsters currently in the team, in the order they would be retrieved.
+        O(n) - Where n is the team size.
+        """
+        return self.strategy.monsters()
+
     def __len__(self) -> int:
         """
         O(1): Simplty returns the length of team size
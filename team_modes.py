@@ -0,0 +1,260 @@
+"""
+Team mode strategies. Each TeamMode of a MonsterTeam has a strategy deciding where monsters
+are added, which monster is retrieved next and what the team's special does.
+
+A strategy is created once per team, in MonsterTeam.__init__, so the team never has to
+branch on its mode again. New modes only need a new strategy in MonsterTeam.STRATEGIES.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from data_structures.min_max_heap import MinMaxHeap
+from data_structures.queue_adt import CircularDeque
+from data_structures.referential_array import ArrayR
+
+if TYPE_CHECKING:
+    from monster_base import MonsterBase
+    from team import MonsterTeam
+
+class TeamStrategy(ABC):
+    """
+    Storage rules of a team mode. Each strategy keeps the team's monsters in its own structure.
+    The team itself checks the team is not full/empty before calling add/retrieve.
+    """
+
+    def __init__(self, team: MonsterTeam) -> None:
+        self.team = team
+        # Storage starts at TEAM_LIMIT and grows as needed, up to the team's own limit.
+        self.capacity = min(team.TEAM_LIMIT, team.team_limit)
+
+    @abstractmethod
+    def add(self, monster: MonsterBase) -> None:
+        """Adds a monster to the team."""
+        pass
+
+    @abstractmethod
+    def retrieve(self) -> MonsterBase:
+        """Removes and returns the next monster to send out."""
+        pass
+
+    @abstractmethod
+    def special(self) -> None:
+        """Reorders the team according to the mode's special."""
+        pass
+
+    @abstractmethod
+    def monsters(self) -> ArrayR[MonsterBase]:
+        """Returns the monsters in the order they would be retrieved."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every monster, keeping the storage for the next team."""
+        pass
+
+    def save(self):
+        """Returns any state besides the monsters' order that restore() needs. O(1)"""
+        return None
+
+    @abstractmethod
+    def restore(self, monsters: ArrayR[MonsterBase], state) -> None:
+        """
+        Replaces the team with `monsters`, in retrieval order, and the state from save().
+        Reuses the existing storage, which never shrinks, so nothing is allocated.
+        """
+        pass
+
+class FrontStrategy(TeamStrategy):
+    """Monsters are added to and retrieved from the front. Special reverses the first 3."""
+
+    SPECIAL_COUNT = 3
+
+    def __init__(self, team: MonsterTeam) -> None:
+        TeamStrategy.__init__(self, team)
+        self.deque = CircularDeque(self.capacity)
+
+    def add(self, monster: MonsterBase) -> None:
+        """O(1) amortised"""
+        self.deque.append_front(monster)
+
+    def retrieve(self) -> MonsterBase:
+        """O(1)"""
+        return self.deque.serve()
+
+    def special(self) -> None:
+        """O(1) - At most SPECIAL_COUNT monsters are served and pushed back in reverse."""
+        count = min(self.SPECIAL_COUNT, len(self.deque))
+        served = ArrayR(self.SPECIAL_COUNT)
+        for i in range(count):
+            served[i] = self.deque.serve()
+        for i in range(count):
+            self.deque.append_front(served[i])
+
+    def monsters(self) -> ArrayR[MonsterBase]:
+        """O(n) - Where n is the team size."""
+        monsters = ArrayR(len(self.deque))
+        for i in range(len(self.deque)):
+            monsters[i] = self.deque[i]
+        return monsters
+
+    def clear(self) -> None:
+        """O(n) - Where n is the team size."""
+        self.deque.clear()
+
+    def restore(self, monsters: ArrayR[MonsterBase], state) -> None:
+        """O(n) - Where n is the team size."""
+        self.deque.clear()
+        for i in range(len(monsters)):
+            self.deque.append(monsters[i])
+
+class BackStrategy(TeamStrategy):
+    """
+    Monsters are added to the back and retrieved from the front.
+    Special swaps the first and second halves, reversing the second half as it moves to the front.
+    With an odd team size, the middle monster belongs to the second half.
+
+    The halves are kept in two deques, with len(first) == team size // 2 after every operation.
+    Special then only reverses and swaps the deques, moving at most one monster across.
+    """
+
+    def __init__(self, team: MonsterTeam) -> None:
+        TeamStrategy.__init__(self, team)
+        self.first = CircularDeque(self.capacity // 2)
+        self.second = CircularDeque(self.capacity - self.capacity // 2)
+
+    def add(self, monster: MonsterBase) -> None:
+        """O(1) amortised"""
+        self.second.append(monster)
+        self._rebalance()
+
+    def retrieve(self) -> MonsterBase:
+        """O(1)"""
+        if self.first.is_empty():
+            # Only one monster left, which belongs to the second half.
+            return self.second.serve()
+        monster = self.first.serve()
+        self._rebalance()
+        return monster
+
+    def special(self) -> None:
+        """O(1)"""
+        self.second.reverse()
+        if len(self.second) > len(self.first):
+            # Odd team size: the new middle monster starts the new second half.
+            self.first.append_front(self.second.serve_rear())
+        self.first, self.second = self.second, self.first
+
+    def monsters(self) -> ArrayR[MonsterBase]:
+        """O(n) - Where n is the team size."""
+        monsters = ArrayR(len(self.first) + len(self.second))
+        for i in range(len(self.first)):
+            monsters[i] = self.first[i]
+        for i in range(len(self.second)):
+            monsters[len(self.first) + i] = self.second[i]
+        return monsters
+
+    def clear(self) -> None:
+        """O(n) - Where n is the team size."""
+        self.first.clear()
+        self.second.clear()
+
+    def restore(self, monsters: ArrayR[MonsterBase], state) -> None:
+        """O(n) - Where n is the team size."""
+        self.clear()
+        middle = len(monsters) // 2
+        for i in range(middle):
+            self.first.append(monsters[i])
+        for i in range(middle, len(monsters)):
+            self.second.append(monsters[i])
+
+    def _rebalance(self) -> None:
+        """Moves the monster at the boundary of the halves, if needed. O(1)"""
+        middle = (len(self.first) + len(self.second)) // 2
+        if len(self.first) < middle:
+            self.first.append(self.second.serve())
+        elif len(self.first) > middle:
+            self.second.append_front(self.first.serve_rear())
+
+class OptimiseStrategy(TeamStrategy):
+    """
+    Monsters are ordered by the team's sort_key, and the highest is retrieved first.
+    Special flips the order, so the lowest is retrieved first until the next special.
+
+    Monsters are kept in a MinMaxHeap of (key, -order, monster) entries.
+    The sort stat is read once as the monster is added, and both ends of the heap are
+    available in O(log n), so special only has to flip which end is retrieved from.
+    Ties go to the monster added first, and special reverses that too.
+    """
+
+    def __init__(self, team: MonsterTeam) -> None:
+        TeamStrategy.__init__(self, team)
+        self.getter = "get_" + team.sort_key.name.lower()
+        self.descending = True
+        self.heap = MinMaxHeap(self.capacity)
+        self.added = 0
+
+    def clear(self) -> None:
+        """O(n) - Where n is the number of monsters left in the heap."""
+        self.heap.clear()
+        self.descending = True
+        self.added = 0
+
+    def save(self):
+        """
+        Returns the cached key and tie order of every monster, in retrieval order like
+        monsters(), so restore() can pair them back up with the snapshot's monsters.
+        O(n log n) - Where n is the team size.
+        """
+        entries = self._drained()
+        keys = ArrayR(len(entries))
+        for i in range(len(entries)):
+            keys[i] = entries[i][:2]
+        return keys, self.descending, self.added
+
+    def restore(self, monsters: ArrayR[MonsterBase], state) -> None:
+        """
+        O(n log n) - The monsters may be new instances, so the entries are rebuilt around
+        them rather than copied back.
+        """
+        keys, self.descending, self.added = state
+        self.heap.clear()
+        for i in range(len(monsters)):
+            self.heap.add((keys[i][0], keys[i][1], monsters[i]))
+
+    def add(self, monster: MonsterBase) -> None:
+        """O(log n) amortised - The heap grows as needed."""
+        self.added += 1
+        self.heap.add((getattr(monster, self.getter)(), -self.added, monster))
+
+    def retrieve(self) -> MonsterBase:
+        """O(log n)"""
+        if self.descending:
+            return self.heap.pop_max()[2]
+        return self.heap.pop_min()[2]
+
+    def special(self) -> None:
+        """O(1) - Only the end monsters are retrieved from changes."""
+        self.descending = not self.descending
+
+    def monsters(self) -> ArrayR[MonsterBase]:
+        """
+        O(n log n) - The entries are drained from a copy of the heap in retrieval order.
+        """
+        entries = self._drained()
+        monsters = ArrayR(len(entries))
+        for i in range(len(entries)):
+            monsters[i] = entries[i][2]
+        return monsters
+
+    def _drained(self) -> ArrayR:
+        """Returns the heap's entries in retrieval order, leaving the heap as it is. O(n log n)"""
+        size = len(self.heap)
+        heap = MinMaxHeap(size)
+        for i in range(size):
+            heap.add(self.heap.array[i])
+        entries = ArrayR(size)
+        for i in range(size):
+            entries[i] = heap.pop_max() if self.descending else heap.pop_min()
+        return entries
@@ -0,0 +1,28 @@
+from enum import auto
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from base_enum import BaseEnum
+from elements import Element
+
+class Element2(BaseEnum):
+    FIRE = auto()
+
+class TestBaseEnum(TestCase):
+
+    @number("0.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_eq_and_hash(self):
+        self.assertEqual(Element.FIRE, Element.FIRE)
+        self.assertNotEqual(Element.FIRE, Element.WATER)
+        self.assertNotEqual(Element.FIRE, 1)
+        # A copy of the class, as if imported from a different location.
+        Copy = BaseEnum("Element", [member.name for member in Element])
+        self.assertEqual(Copy.FIRE, Element.FIRE)
+        self.assertEqual(hash(Copy.FIRE), hash(Element.FIRE))
+        self.assertNotEqual(Element2.FIRE, Element.FIRE)
+        lookup = {Element.FIRE: "fire", Element.WATER: "water"}
+        self.assertEqual(lookup[Copy.WATER], "water")
@@ -1,9 +1,12 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from ed_utils.decorators import number, visibility
 from ed_utils.timeout import timeout
 
 from battle import Battle
+from elements import EffectivenessCalculator
+from monster_base import MonsterBase
+from random_gen import RandomGen
 from team import MonsterTeam
 from helpers import Flamikin, Aquariuma, Vineon, Strikeon, Normake, Marititan, Leviatitan, Treetower, Infernoth
 
@@ -38,6 +41,110 @@ class BattleMock(Battle):
             self.cur_index += 1
         return super().process_turn()
 
+class StubMonster(MonsterBase):
+    """A MonsterBase with fixed per-level stats, independent of the helpers factory."""
+
+    ATTACK = DEFENSE = SPEED = MAX_HP = 1
+    ELEMENT = "Normal"
+
+    def __init__(self, simple_mode=True, level:int=1) -> None:
+        self.level = level
+        self.hp = self.get_max_hp()
+
+    def get_level(self):
+        return self.level
+
+    def level_up(self):
+        max_hp = self.get_max_hp()
+        self.level += 1
+        self.hp += self.get_max_hp() - max_hp
+
+    def get_hp(self):
+        return self.hp
+
+    def set_hp(self, val):
+        self.hp = val
+
+    def get_attack(self):
+        return self.ATTACK + self.level
+
+    def get_defense(self):
+        return self.DEFENSE + self.level // 2
+
+    def get_speed(self):
+        return self.SPEED + self.level
+
+    def get_max_hp(self):
+        return self.MAX_HP + 2 * self.level
+
+    def alive(self):
+        return self.hp > 0
+
+    def ready_to_evolve(self):
+        return False
+
+    def __str__(self):
+        return f"LV.{self.level} {type(self).__name__}, {self.hp}/{self.get_max_hp()} HP"
+
+    get_name = classmethod(lambda cls: cls.__name__)
+    get_description = classmethod(lambda cls: "")
+    get_evolution = classmethod(lambda cls: None)
+    get_element = classmethod(lambda cls: cls.ELEMENT)
+    can_be_spawned = classmethod(lambda cls: True)
+    get_simple_stats = classmethod(lambda cls: None)
+    get_complex_stats = classmethod(lambda cls: None)
+
+class Small(StubMonster):
+    ATTACK, DEFENSE, SPEED, MAX_HP = 4, 1, 5, 12
+
+class Fast(StubMonster):
+    ATTACK, DEFENSE, SPEED, MAX_HP = 3, 0, 9, 10
+
+class Tank(StubMonster):
+    ATTACK, DEFENSE, SPEED, MAX_HP = 6, 2, 1, 30
+
+# Module level, like the stubs, so specs built from them can be sent to worker processes.
+STUBS = [Small, Fast, Tank]
+
+def stub_team(monsters):
+    """A BACK MonsterTeam of the given stub classes, in order."""
+    return MonsterTeam(
+        team_mode=MonsterTeam.TeamMode.BACK,
+        selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+        provided_monsters=ArrayR.from_list(monsters),
+    )
+
+def random_stub_class(max_defense=2, elements=("Normal", )):
+    return type("Stub", (StubMonster, ), {
+        "ATTACK": RandomGen.randint(2, 12),
+        "DEFENSE": RandomGen.randint(0, max_defense),
+        "SPEED": RandomGen.randint(1, 10),
+        "MAX_HP": RandomGen.randint(5, 40),
+        "ELEMENT": RandomGen.random_choice(elements),
+    })
+
+class StackTeam(MonsterTeam):
+    """A MonsterTeam storing monsters in a python list, used as a stack."""
+
+    def __init__(self, monsters) -> None:
+        self.monsters = []
+        super().__init__(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.PROVIDED, provided_monsters=monsters)
+
+    def add_to_team(self, monster):
+        self.monsters.append(monster)
+
+    def retrieve_from_team(self):
+        return self.monsters.pop()
+
+    def special(self):
+        self.monsters.reverse()
+
+    def __len__(self):
+        return len(self.monsters)
+
+    def get_monsters(self):
+        return ArrayR.from_list(self.monsters)
+
 class TestBattle(TestCase):
 
     @number("4.1")
@@ -133,3 +240,87 @@ class TestBattle(TestCase):
         ]
         res = b.battle(team1, team2)
         self.assertEqual(res, Battle.Result.DRAW)
+
+    @number("4.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_fast_engine_matches(self):
+        RandomGen.set_seed(20231017)
+        for _ in range(200):
+            classes1 = ArrayR.from_list([random_stub_class() for _ in range(RandomGen.randint(1, 6))])
+            classes2 = ArrayR.from_list([random_stub_class() for _ in range(RandomGen.randint(1, 6))])
+            slow = Battle()
+            fast = Battle(fast=True)
+            expected = slow.battle(StackTeam(classes1), StackTeam(classes2))
+            self.assertEqual(fast.battle(StackTeam(classes1), StackTeam(classes2)), expected)
+            self.assertEqual(fast.turn_number, slow.turn_number)
+            self.assertEqual(str(fast.out1), str(slow.out1))
+            self.assertEqual(str(fast.out2), str(slow.out2))
+
+    @number("4.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_fast_engine_skips_stalls(self):
+        RandomGen.set_seed(1008)
+        for _ in range(20):
+            classes1 = ArrayR.from_list([random_stub_class() for _ in range(2)])
+            classes2 = ArrayR.from_list([random_stub_class() for _ in range(2)])
+            for cls in classes1.to_list() + classes2.to_list():
+                cls.MAX_HP *= 100
+            slow = Battle()
+            fast = Battle(fast=True)
+            expected = slow.battle(StackTeam(classes1), StackTeam(classes2))
+            self.assertEqual(fast.battle(StackTeam(classes1), StackTeam(classes2)), expected)
+            self.assertEqual(fast.turn_number, slow.turn_number)
+            self.assertEqual(str(fast.out1), str(slow.out1))
+            self.assertEqual(str(fast.out2), str(slow.out2))
+
+    @number("4.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_fast_engine_matches_high_defense(self):
+        # Defense can match or beat attack, and element effectiveness can be 0 to 2.
+        RandomGen.set_seed(31337)
+        elements = ("Normal", "Fire", "Water", "Grass", "Ghost", "Rock")
+        for _ in range(200):
+            classes1 = ArrayR.from_list([random_stub_class(15, elements) for _ in range(RandomGen.randint(1, 6))])
+            classes2 = ArrayR.from_list([random_stub_class(15, elements) for _ in range(RandomGen.randint(1, 6))])
+            slow = Battle()
+            fast = Battle(fast=True)
+            expected = slow.battle(StackTeam(classes1), StackTeam(classes2))
+            self.assertEqual(fast.battle(StackTeam(classes1), StackTeam(classes2)), expected)
+            self.assertEqual(fast.turn_number, slow.turn_number)
+            self.assertEqual(str(fast.out1), str(slow.out1))
+            self.assertEqual(str(fast.out2), str(slow.out2))
+
+    @number("4.17")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_reload_mid_battle(self):
+        # Every Normal attack does no damage under this table.
+        harmless = EffectivenessCalculator(ArrayR.from_list(["Normal"]), ArrayR.from_list([0.0]))
+        classes1 = ArrayR.from_list([type("Stub", (StubMonster, ), {"ATTACK": 6, "MAX_HP": 20})])
+        classes2 = ArrayR.from_list([type("Stub", (StubMonster, ), {"ATTACK": 5, "MAX_HP": 20})])
+
+        def attack(out, enemy):
+            return Battle.Action.ATTACK
+
+        def reload_then_attack(out, enemy):
+            EffectivenessCalculator.instance = harmless
+            return Battle.Action.ATTACK
+
+        for fast in (False, True):
+            expected = Battle(fast=fast)
+            team1 = StackTeam(classes1)
+            team1.choose_action = attack
+            expected_result = expected.battle(team1, StackTeam(classes2))
+            team1 = StackTeam(classes1)
+            team1.choose_action = reload_then_attack
+            with mock.patch.object(EffectivenessCalculator, "instance", EffectivenessCalculator.instance):
+                b = Battle(fast=fast)
+                result = b.battle(team1, StackTeam(classes2))
+                self.assertIs(EffectivenessCalculator.instance, harmless)
+            self.assertEqual(result, expected_result)
+            self.assertEqual(b.turn_number, expected.turn_number)
+            self.assertEqual(str(b.out1), str(expected.out1))
+            self.assertEqual(str(b.out2), str(expected.out2))
@@ -1,9 +1,11 @@
+import os
+import tempfile
 from unittest import TestCase
 
 from ed_utils.decorators import number, visibility
 from ed_utils.timeout import timeout
 
-from elements import EffectivenessCalculator, Element
+from elements import EffectivenessCalculator, Element, ElementSet
 
 class TestElementEffectiveness(TestCase):
 
@@ -16,3 +18,73 @@ class TestElementEffectiveness(TestCase):
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.NORMAL, Element.GHOST), 0)
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.DRAGON, Element.DRAGON), 2)
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.WATER, Element.GRASS), 0.5)
+
+    @number("2.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_rows_and_matrix(self):
+        matrix = EffectivenessCalculator.get_matrix()
+        for attacker in Element:
+            row = EffectivenessCalculator.get_row(attacker)
+            for defender in Element:
+                expected = EffectivenessCalculator.get_effectiveness(attacker, defender)
+                self.assertEqual(row[defender.value - 1], expected)
+                self.assertEqual(matrix[attacker.value - 1, defender.value - 1], expected)
+
+    @number("2.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_column_order(self):
+        # Reversing the CSV order must not change any lookup.
+        with open("type_effectiveness.csv") as f:
+            lines = [line.split(",") for line in f.read().strip().split("\n")]
+        header, rows = lines[0], lines[1:]
+        reversed_rows = [",".join(row[::-1]) for row in rows[::-1]]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "reversed.csv")
+            with open(path, "w") as f:
+                f.write("\n".join([",".join(header[::-1])] + reversed_rows))
+            calculator = EffectivenessCalculator.from_csv(path, validate=True)
+            with open(path, "w") as f:
+                f.write("\n".join([",".join(header[::-1])] + reversed_rows[:-1]))
+            self.assertRaises(ValueError, lambda: EffectivenessCalculator.from_csv(path, validate=True))
+        for attacker in Element:
+            for defender in Element:
+                self.assertEqual(
+                    calculator.rows[attacker.value - 1][defender.value - 1],
+                    EffectivenessCalculator.get_effectiveness(attacker, defender),
+                )
+
+    @number("2.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_reload(self):
+        old = EffectivenessCalculator.instance
+        old_row = EffectivenessCalculator.get_row(Element.FIRE)
+        try:
+            new = EffectivenessCalculator.reload()
+            self.assertIsNot(new, old)
+            self.assertIs(EffectivenessCalculator.instance, new)
+            self.assertEqual(old_row[Element.WATER.value - 1], 0.5)
+            self.assertRaises(TypeError, lambda: old_row.__setitem__(0, 3.0))
+        finally:
+            EffectivenessCalculator.instance = old
+
+    @number("2.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_element_set(self):
+        elements = ElementSet()
+        for element in (Element.STEEL, Element.FIRE, Element.ICE, Element.FIRE):
+            elements.add(element.value)
+        self.assertEqual(len(elements), 3)
+        self.assertIn(Element.ICE.value, elements)
+        self.assertListEqual(elements.to_list(), [Element.FIRE, Element.ICE, Element.STEEL])
+        others = ElementSet()
+        for element in (Element.ICE, Element.WATER):
+            others.add(element.value)
+        # Set operations keep the result an ElementSet, so to_list still gives Elements.
+        self.assertListEqual(elements.union(others).to_list(), [Element.FIRE, Element.WATER, Element.ICE, Element.STEEL])
+        self.assertListEqual(elements.intersection(others).to_list(), [Element.ICE])
+        self.assertListEqual(elements.difference(others).to_list(), [Element.FIRE, Element.STEEL])
+        self.assertIsInstance(elements | others, ElementSet)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+import helpers
+
+class TestHelpers(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        catalogue = os.path.join(self.tmp_dir, "monsters.yaml")
+        shutil.copy(helpers.CATALOGUE_FILE, catalogue)
+        self.patches = [
+            mock.patch.object(helpers, "CATALOGUE_FILE", catalogue),
+            mock.patch.object(helpers, "CACHE_FILE", os.path.join(self.tmp_dir, "monsters.cache")),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    @number("0.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_catalogue_cache(self):
+        records = helpers._load_catalogue()
+        self.assertTrue(os.path.exists(helpers.CACHE_FILE))
+        with mock.patch.object(helpers.yaml, "safe_load") as safe_load:
+            self.assertEqual(helpers._load_catalogue(), records)
+            # Touching the file without changing it is caught by the hash.
+            os.utime(helpers.CATALOGUE_FILE, ns=(1, 1))
+            self.assertEqual(helpers._load_catalogue(), records)
+            safe_load.assert_not_called()
+        with open(helpers.CATALOGUE_FILE, "a") as f:
+            f.write("- name: Extra\n")
+        self.assertEqual(helpers._load_catalogue()[-1], {"name": "Extra"})
+
+    @number("0.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_reload_monsters(self):
+        old_catalogue = helpers._catalogue
+        old_flamikin = helpers.Flamikin
+        with open(helpers.CATALOGUE_FILE) as f:
+            contents = f.read()
+        # Flamikin's simple attack is the first "attack: 3" in the file, after its complex stats.
+        first = contents.index("attack: 3")
+        second = contents.index("attack: 3", first + 1)
+        with open(helpers.CATALOGUE_FILE, "w") as f:
+            f.write(contents[:second] + "attack: 30" + contents[second + len("attack: 3"):])
+        try:
+            helpers.reload_monsters()
+            self.assertEqual(helpers.Flamikin.get_simple_stats().get_attack(), 30)
+            self.assertIs(helpers.get_all_monsters()[0], helpers.Flamikin)
+            # Classes from the old snapshot are untouched, and still evolve within it.
+            self.assertEqual(old_flamikin.get_simple_stats().get_attack(), 3)
+            self.assertIs(old_flamikin.get_evolution(), old_catalogue.classes["Infernoth"])
+        finally:
+            helpers._catalogue = old_catalogue
+            vars(helpers).update(old_catalogue.classes)
+
+    @number("0.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_reload_balance_atomic(self):
+        from elements import EffectivenessCalculator
+        old_calculator = EffectivenessCalculator.instance
+        old_catalogue = helpers._catalogue
+        with open(helpers.CATALOGUE_FILE, "a") as f:
+            f.write("- name: [Unclosed\n")
+        self.assertRaises(helpers.yaml.YAMLError, helpers.reload_balance)
+        self.assertIs(EffectivenessCalculator.instance, old_calculator)
+        self.assertIs(helpers._catalogue, old_catalogue)
+        shutil.copy("monsters.yaml", helpers.CATALOGUE_FILE)
+        csv_file = os.path.join(self.tmp_dir, "type_effectiveness.csv")
+        with open(csv_file, "w") as f:
+            f.write("Normal,Fire\n1,1\n1,1\n")
+        self.assertRaises(ValueError, helpers.reload_balance, csv_file)
+        self.assertIs(EffectivenessCalculator.instance, old_calculator)
+        self.assertIs(helpers._catalogue, old_catalogue)
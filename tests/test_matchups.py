@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from battle import Battle
+from matchups import Matchup, rank_opponents
+from tests.test_battle import StubMonster, StackTeam, random_stub_class
+
+from data_structures.referential_array import ArrayR
+
+class Weak(StubMonster):
+    ATTACK, DEFENSE, SPEED, MAX_HP = 2, 0, 1, 5
+
+class Strong(StubMonster):
+    ATTACK, DEFENSE, SPEED, MAX_HP = 9, 1, 5, 20
+
+class TestMatchups(TestCase):
+
+    @number("4.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_matrix(self):
+        team1 = StackTeam(ArrayR.from_list([Weak, Strong]))
+        team2 = StackTeam(ArrayR.from_list([Strong]))
+        matchup = Matchup(team1, team2)
+        self.assertEqual(matchup.damage.shape, (2, 1))
+        # Level 1 stubs: Weak has 3 attack, 0 defense and 7 HP, Strong 10, 1 and 22.
+        # All stubs are Normal, which is neutral against itself.
+        self.assertListEqual(matchup.damage[:, 0].tolist(), [2, 9])
+        self.assertListEqual(matchup.damage_taken[:, 0].tolist(), [10, 9])
+        self.assertListEqual(matchup.turns_to_faint[:, 0].tolist(), [8, 3])
+        self.assertListEqual(matchup.turns_to_be_fainted[:, 0].tolist(), [1, 3])
+        self.assertListEqual(matchup.wins()[:, 0].tolist(), [-1, 0])
+        self.assertEqual(matchup.estimate_result(), Battle.Result.TEAM2)
+
+    @number("4.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_rank_opponents(self):
+        team = StackTeam(ArrayR.from_list([Strong]))
+        opponents = ArrayR.from_list([
+            StackTeam(ArrayR.from_list([Strong, Strong])),
+            StackTeam(ArrayR.from_list([Weak])),
+        ])
+        self.assertListEqual(rank_opponents(team, opponents).to_list(), [1, 0])
+
+    @number("4.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_matches_battle(self):
+        wall = type("Wall", (StubMonster, ), {"ATTACK": 1, "DEFENSE": 12, "MAX_HP": 20, "ELEMENT": "Rock"})
+        slow = type("Slow", (Strong, ), {"SPEED": 1})
+        team1 = StackTeam(ArrayR.from_list([Weak, Strong, wall]))
+        team2 = StackTeam(ArrayR.from_list([slow, wall]))
+        matchup = Matchup(team1, team2)
+        monsters1, monsters2 = team1.get_monsters(), team2.get_monsters()
+        for i in range(len(monsters1)):
+            for j in range(len(monsters2)):
+                self.assertEqual(matchup.damage[i, j], monsters1[i].damage_against(monsters2[j]))
+                self.assertEqual(matchup.damage_taken[i, j], monsters2[j].damage_against(monsters1[i]))
+        # A defense above the attack still takes damage, and never heals.
+        self.assertEqual(matchup.damage[0, 1], 1)
+        # Strong and Slow would both faint on turn 3, but Strong is faster and faints Slow first.
+        self.assertEqual(matchup.wins()[1, 0], 1)
+        self.assertEqual(Battle().battle(StackTeam(ArrayR.from_list([Strong])), StackTeam(ArrayR.from_list([slow]))), Battle.Result.TEAM1)
+        # With equal speeds both faint at once.
+        self.assertEqual(Matchup(StackTeam(ArrayR.from_list([Strong])), StackTeam(ArrayR.from_list([Strong]))).wins()[0, 0], 0)
+        self.assertEqual(Battle().battle(StackTeam(ArrayR.from_list([Strong])), StackTeam(ArrayR.from_list([Strong]))), Battle.Result.DRAW)
+        # One on one, the estimate is the battle's result.
+        RandomGen.set_seed(4)
+        outcomes = {Battle.Result.TEAM1: 1, Battle.Result.TEAM2: -1, Battle.Result.DRAW: 0}
+        for _ in range(200):
+            classes = [ArrayR.from_list([random_stub_class(15, ("Normal", "Fire", "Water", "Rock"))]) for _ in range(2)]
+            team1, team2 = StackTeam(classes[0]), StackTeam(classes[1])
+            team1.choose_action = team2.choose_action = lambda out, enemy: Battle.Action.ATTACK
+            expected = Matchup(team1, team2).wins()[0, 0]
+            self.assertEqual(outcomes[Battle().battle(team1, team2)], expected)
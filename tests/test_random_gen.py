@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from random_gen import RandomGen, RandomStream
+
+class TestRandomGen(TestCase):
+
+    @number("0.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_default_stream(self):
+        RandomGen.set_seed(123456789)
+        stream = RandomStream(123456789)
+        for _ in range(20):
+            self.assertEqual(RandomGen.randint(1, 100), stream.randint(1, 100))
+
+    @number("0.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_jump(self):
+        stepped = RandomStream(2023)
+        jumped = RandomStream(2023)
+        for _ in range(1234):
+            stepped.random()
+        jumped.jump(1234)
+        self.assertEqual(jumped.seed, stepped.seed)
+        self.assertEqual(jumped.random(), stepped.random())
+
+    @number("0.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_split(self):
+        parent = RandomStream(99)
+        expected = RandomStream(99)
+        child = parent.split()
+        # The child continues where the parent was, the parent skips ahead.
+        self.assertEqual(child.random(), expected.random())
+        expected.jump(RandomStream.SPLIT_DISTANCE - 1)
+        self.assertEqual(parent.random(), expected.random())
+
+    @number("0.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_blocks(self):
+        RandomGen.set_seed(31337)
+        expected = RandomStream(31337)
+        block = RandomGen.random_block(50)
+        self.assertListEqual(block.to_list(), [expected.random() for _ in range(50)])
+        block = RandomGen.randint_block(3, 9, 50)
+        self.assertListEqual(block.to_list(), [expected.randint(3, 9) for _ in range(50)])
+        # The default stream carries on from the end of the block.
+        self.assertEqual(RandomGen.random(), expected.random())
+
+    @number("0.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_using(self):
+        RandomGen.set_seed(5)
+        default = RandomGen.stream
+        stream = RandomStream(6)
+        expected = RandomStream(6)
+        with self.assertRaises(KeyError):
+            with RandomGen.using(stream):
+                self.assertEqual(RandomGen.random(), expected.random())
+                raise KeyError
+        # The default stream is back, and wasn't drawn from.
+        self.assertIs(RandomGen.stream, default)
+        self.assertEqual(RandomGen.random(), RandomStream(5).random())
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from simulation import simulate_many, simulate_stream
+from tests.test_battle import STUBS, StackTeam
+
+from data_structures.referential_array import ArrayR
+
+def random_stack_team():
+    size = RandomGen.randint(1, 4)
+    return StackTeam(ArrayR.from_list([RandomGen.random_choice(STUBS) for _ in range(size)]))
+
+class TestSimulation(TestCase):
+
+    @number("4.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(10)
+    def test_reproducible(self):
+        RandomGen.set_seed(42)
+        single = simulate_many(random_stack_team, random_stack_team, 300, workers=1, chunk_size=50)
+        RandomGen.set_seed(42)
+        pooled = simulate_many(random_stack_team, random_stack_team, 300, workers=2, chunk_size=50)
+        self.assertEqual(len(single), 300)
+        self.assertEqual(
+            (single.team1_wins, single.team2_wins, single.draws),
+            (pooled.team1_wins, pooled.team2_wins, pooled.draws),
+        )
+        self.assertDictEqual(single.turn_histogram, pooled.turn_histogram)
+        self.assertGreater(single.team1_wins, 0)
+        self.assertGreater(single.team2_wins, 0)
+
+    @number("4.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_streaming(self):
+        RandomGen.set_seed(7)
+        seen = list(simulate_stream(random_stack_team, random_stack_team, 120, chunk_size=50))
+        # Each total is a copy, so the earlier ones still hold the earlier counts.
+        self.assertListEqual([len(total) for total in seen], [50, 100, 120])
+
+    @number("4.16")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(10)
+    def test_caller_stream_untouched(self):
+        after = []
+        for workers in (1, 2):
+            RandomGen.set_seed(99)
+            simulate_many(random_stack_team, random_stack_team, 100, workers=workers, chunk_size=50)
+            after.append(RandomGen.random())
+        # Only the chunk seeds are drawn from RandomGen, whatever the number of workers.
+        RandomGen.set_seed(99)
+        RandomGen.random()
+        RandomGen.random()
+        self.assertListEqual(after, [RandomGen.random()] * 2)
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from stats import ComplexStats
+from stat_curves import evaluate_levels, stat_curves
+from helpers import Flamikin, Faeboa
+
+from data_structures.referential_array import ArrayR
+
+class TestStatCurves(TestCase):
+
+    @number("4.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_matches_evaluate_expression(self):
+        formula = ArrayR.from_list([
+            "level", "3", "/", "level", "sqrt", "4", "middle", "1.5", "power", "2", "-",
+        ])
+        cs = ComplexStats(formula, formula, formula, formula)
+        got = evaluate_levels(formula, range(1, 60)).tolist()
+        expected = [cs.evaluate_expression(formula, level) for level in range(1, 60)]
+        self.assertListEqual(got, expected)
+
+    @number("4.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_curve_shape(self):
+        curves = stat_curves(ArrayR.from_list([Flamikin, Faeboa]), range(1, 11))
+        self.assertEqual(curves["attack"].shape, (10, 2))
+        self.assertEqual(curves["max_hp"][0, 0], Flamikin.get_complex_stats().get_max_hp(1))
+        self.assertEqual(curves["speed"][9, 1], Faeboa.get_complex_stats().get_speed(10))
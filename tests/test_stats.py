@@ -59,3 +59,34 @@ class TestStats(TestCase):
         self.assertEqual(cs.get_defense(1), 8)
         self.assertEqual(cs.get_speed(5), 250)
         self.assertEqual(cs.get_max_hp(41), 6)
+
+    @number("4.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_compiled_matches_evaluated(self):
+        formula = ArrayR.from_list([
+            "level", "2", "/", "level", "sqrt", "3", "middle", "1.5", "power", "7", "+",
+        ])
+        compiled = ComplexStats.compile_expression(formula)
+        cs = ComplexStats(formula, formula, formula, formula)
+        for level in range(1, 50):
+            expected = cs.evaluate_expression(formula, level)
+            self.assertEqual(compiled(level), expected)
+            self.assertEqual(cs.get_attack(level), expected)
+
+    @number("4.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_level_cache(self):
+        formula = ArrayR.from_list(["level", "3", "*"])
+        cs = ComplexStats(formula, formula, formula, formula, cache_max_level=10)
+        self.assertEqual(cs.get_attack(5), 15)
+        self.assertEqual(cs.get_attack(5), 15)
+        self.assertEqual(cs.cache_info(), (1, 1))
+        # Levels past the table go through the LRU.
+        self.assertEqual(cs.get_attack(500), 1500)
+        self.assertEqual(cs.get_attack(500), 1500)
+        self.assertEqual(cs.cache_info(), (2, 2))
+        for level in range(11, 11 + ComplexStats.OVERFLOW_CAPACITY):
+            cs.get_attack(level)
+        self.assertNotIn(("attack", 500), cs._overflow)
@@ -8,7 +8,10 @@ from ed_utils.timeout import timeout
 from random_gen import RandomGen
 
 from team import MonsterTeam
+from team_modes import BackStrategy
+from tests.test_battle import StubMonster
 from helpers import Flamikin, Aquariuma, Vineon, Normake, Thundrake, Rockodile, Mystifly, Strikeon, Faeboa, Soundcobra
+from helpers import get_all_monsters, get_spawnable_monsters, get_spawnable_monsters_by_element
 
 from data_structures.referential_array import ArrayR
 
@@ -260,3 +263,147 @@ class TestTeam(TestCase):
 
         self.assertEqual(len(team), 1)
         self.assertIsInstance(team.retrieve_from_team(), Flamikin)
+
+    @number("3.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_spawnable_index(self):
+        monsters = get_all_monsters()
+        expected = [monster for monster in monsters if monster.can_be_spawned()]
+        self.assertListEqual(get_spawnable_monsters().to_list(), expected)
+        fire = [monster for monster in expected if monster.get_element() == "Fire"]
+        self.assertListEqual(get_spawnable_monsters_by_element("Fire").to_list(), fire)
+
+    @number("3.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_mode_strategies(self):
+        stubs = [type(f"Stub{i}", (StubMonster, ), {"MAX_HP": i}) for i in range(6)]
+        def names(team):
+            return [type(monster).__name__ for monster in team.get_monsters()]
+
+        back = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.PROVIDED,
+                           provided_monsters=ArrayR.from_list(stubs[:5]))
+        self.assertIsInstance(back.strategy, BackStrategy)
+        back.special()
+        self.assertListEqual(names(back), ["Stub4", "Stub3", "Stub2", "Stub0", "Stub1"])
+        self.assertIsInstance(back.retrieve_from_team(), stubs[4])
+
+        front = MonsterTeam(MonsterTeam.TeamMode.FRONT, MonsterTeam.SelectionMode.PROVIDED,
+                            provided_monsters=ArrayR.from_list(stubs[:4]))
+        self.assertListEqual(names(front), ["Stub3", "Stub2", "Stub1", "Stub0"])
+        front.special()
+        self.assertListEqual(names(front), ["Stub1", "Stub2", "Stub3", "Stub0"])
+
+        optimise = MonsterTeam(MonsterTeam.TeamMode.OPTIMISE, MonsterTeam.SelectionMode.PROVIDED,
+                               sort_key=MonsterTeam.SortMode.HP, provided_monsters=ArrayR.from_list([stubs[2], stubs[5], stubs[0]]))
+        self.assertListEqual(names(optimise), ["Stub5", "Stub2", "Stub0"])
+        optimise.special()
+        optimise.add_to_team(stubs[1]())
+        self.assertListEqual(names(optimise), ["Stub0", "Stub1", "Stub2", "Stub5"])
+        self.assertIsInstance(optimise.retrieve_from_team(), stubs[0])
+
+    @number("3.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_optimise_heap(self):
+        stubs = [type(f"Stub{i}", (StubMonster, ), {"MAX_HP": i % 3}) for i in range(6)]
+        team = MonsterTeam(MonsterTeam.TeamMode.OPTIMISE, MonsterTeam.SelectionMode.PROVIDED,
+                           sort_key=MonsterTeam.SortMode.HP, provided_monsters=ArrayR.from_list(stubs))
+        # Equal HP goes to the monster added first, and the special reverses the whole order.
+        order = [type(monster).__name__ for monster in team.get_monsters()]
+        self.assertListEqual(order, ["Stub2", "Stub5", "Stub1", "Stub4", "Stub0", "Stub3"])
+        team.special()
+        self.assertListEqual([type(monster).__name__ for monster in team.get_monsters()], order[::-1])
+        self.assertIsInstance(team.retrieve_from_team(), stubs[3])
+        team.special()
+        self.assertIsInstance(team.retrieve_from_team(), stubs[2])
+        # The sort stat is read once when added, not on every comparison.
+        with mock.patch.object(StubMonster, "get_hp", autospec=True, side_effect=lambda monster: 1) as get_hp:
+            team.add_to_team(stubs[0]())
+            team.retrieve_from_team()
+            self.assertEqual(get_hp.call_count, 1)
+
+    @number("3.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_large_roster(self):
+        stubs = ArrayR.from_list([type(f"Stub{i}", (StubMonster, ), {"MAX_HP": i % 7}) for i in range(300)])
+        for mode in MonsterTeam.TeamMode:
+            team = MonsterTeam(mode, MonsterTeam.SelectionMode.PROVIDED, sort_key=MonsterTeam.SortMode.HP,
+                               team_limit=300, provided_monsters=stubs)
+            self.assertEqual(len(team), 300)
+            self.assertRaises(ValueError, lambda: team.add_to_team(stubs[0]()))
+            hps = [monster.get_hp() for monster in team.get_monsters()]
+            if mode == MonsterTeam.TeamMode.OPTIMISE:
+                self.assertListEqual(hps, sorted(hps, reverse=True))
+            team.regenerate_team()
+            self.assertEqual(len(team), 0)
+            team.add_to_team(stubs[1]())
+            self.assertIsInstance(team.retrieve_from_team(), stubs[1])
+        self.assertRaises(ValueError, lambda: MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.PROVIDED,
+                                                          team_limit=0, provided_monsters=stubs))
+
+    @number("3.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_deque_modes_match_list_model(self):
+        RandomGen.set_seed(1008)
+        for mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK):
+            team = MonsterTeam(mode, MonsterTeam.SelectionMode.PROVIDED, team_limit=50, provided_monsters=ArrayR(0))
+            model = []
+            for _ in range(500):
+                choice = RandomGen.randint(1, 3)
+                if choice == 1 and len(model) < 50:
+                    monster = StubMonster()
+                    team.add_to_team(monster)
+                    if mode == MonsterTeam.TeamMode.FRONT:
+                        model.insert(0, monster)
+                    else:
+                        model.append(monster)
+                elif choice == 2 and model:
+                    self.assertIs(team.retrieve_from_team(), model.pop(0))
+                else:
+                    team.special()
+                    if mode == MonsterTeam.TeamMode.FRONT:
+                        model[:3] = model[:3][::-1]
+                    else:
+                        middle = len(model) // 2
+                        model = model[middle:][::-1] + model[:middle]
+                self.assertListEqual(list(team.get_monsters()), model)
+
+    @number("3.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_snapshot_restore(self):
+        stubs = ArrayR.from_list([type(f"Stub{i}", (StubMonster, ), {"MAX_HP": 5 - i}) for i in range(5)])
+        for mode in MonsterTeam.TeamMode:
+            team = MonsterTeam(mode, MonsterTeam.SelectionMode.PROVIDED, sort_key=MonsterTeam.SortMode.HP,
+                               provided_monsters=stubs)
+            team.special()
+            before = team.get_monsters()
+            snapshot = team.snapshot()
+            # Drain and damage the team, as a battle would, levelling up every other monster.
+            levelled = []
+            while len(team):
+                monster = team.retrieve_from_team()
+                if len(team) % 2 == 0:
+                    monster.level_up()
+                    levelled.append(monster)
+                monster.set_hp(0)
+            team.restore(snapshot)
+            self.assertEqual(len(team), 5)
+            after = team.get_monsters()
+            self.assertListEqual([type(monster) for monster in after], [type(monster) for monster in before])
+            for i in range(len(after)):
+                # Only the monsters that levelled up are rebuilt.
+                if before[i] in levelled:
+                    self.assertIsNot(after[i], before[i])
+                else:
+                    self.assertIs(after[i], before[i])
+                self.assertEqual(after[i].get_level(), 1)
+                self.assertEqual(after[i].get_hp(), after[i].get_max_hp())
+            # The restored team keeps working as before, including ties in OPTIMISE.
+            team.special()
+            team.add_to_team(stubs[0]())
+            self.assertEqual(len(team.get_monsters()), 6)
@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from battle import Battle
+from tournament import TowerRun, run_tournament
+from tests.test_battle import STUBS, Fast, Small, Tank, stub_team
+
+def tanks():
+    return stub_team([Tank, Tank])
+
+def fast_and_small():
+    return stub_team([Fast, Small, Fast])
+
+def random_stub_team():
+    # Drawn from the tower's own stream, which run_tournament points RandomGen at.
+    return stub_team([RandomGen.random_choice(STUBS) for _ in range(RandomGen.randint(1, 4))])
+
+CANDIDATES = [tanks, fast_and_small, random_stub_team]
+
+class TestTournament(TestCase):
+
+    @number("5.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_tower_run_ranking(self):
+        cleared = TowerRun(1)
+        cleared.record(Battle.Result.TEAM1, 0)
+        cleared.record(Battle.Result.TEAM2, 3)
+        lost = TowerRun(0)
+        lost.record(Battle.Result.TEAM2, 3)
+        lost.player_lives = 5
+        self.assertEqual((cleared.wins, cleared.losses, cleared.teams_defeated), (1, 1, 1))
+        # Defeating a team beats having lives left, and ties go to the earlier candidate.
+        self.assertLess(cleared.rank_key(), lost.rank_key())
+        self.assertLess(TowerRun(0).rank_key(), TowerRun(1).rank_key())
+
+    @number("5.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(20)
+    def test_reproducible_leaderboard(self):
+        RandomGen.set_seed(123456789)
+        single = run_tournament(CANDIDATES, 10, workers=1, tower_team=random_stub_team)
+        after_single = RandomGen.random()
+        RandomGen.set_seed(123456789)
+        pooled = run_tournament(CANDIDATES, 10, workers=2, tower_team=random_stub_team)
+        self.assertEqual(RandomGen.random(), after_single)
+        self.assertListEqual([str(run) for run in single], [str(run) for run in pooled])
+        self.assertListEqual(sorted(run.candidate for run in single), [0, 1, 2])
+        for better, worse in zip(single, list(single)[1:]):
+            self.assertLess(better.rank_key(), worse.rank_key())
+        self.assertGreater(sum(run.wins + run.losses + run.draws for run in single), 10)
+        self.assertRaises(ValueError, run_tournament, CANDIDATES, 10, shared_teams=True, tower_team=random_stub_team)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from battle import Battle
+from tower import BattleTower, BattleRecord, ResultFileWriter
+from tests.test_battle import StubMonster, stub_team
+
+class Champion(StubMonster):
+    ATTACK, DEFENSE, SPEED, MAX_HP = 100, 0, 50, 100
+
+class Minion(StubMonster):
+    ATTACK, DEFENSE, SPEED, MAX_HP = 1, 0, 1, 5
+
+class TestTowerStream(TestCase):
+
+    def make_tower(self):
+        bt = BattleTower(Battle(verbosity=0))
+        bt.set_my_team(stub_team([Champion]))
+        bt.player_team.lives = 4
+        # The Champion beats every Minion, so each team battles once per life.
+        for lives in (3, 2, 1):
+            bt.add_team(stub_team([Minion]), lives)
+        return bt
+
+    @number("5.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_stream_results(self):
+        bt = self.make_tower()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            with ResultFileWriter(path) as sink:
+                batches = list(bt.stream_results(batch_size=4, sink=sink))
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertListEqual([len(batch) for batch in batches], [4, 2])
+        records = [record for batch in batches for record in batch]
+        self.assertEqual(records[0], BattleRecord(Battle.Result.TEAM1, 0, 4, 2, 1))
+        self.assertListEqual([record.tower_team for record in records], [0, 1, 2, 0, 1, 0])
+        self.assertListEqual([record.tower_lives for record in records], [2, 1, 0, 1, 0, 0])
+        self.assertListEqual(lines, [
+            f"{record.result.name},{record.tower_team},{record.player_lives},{record.tower_lives},{record.turns}"
+            for record in records
+        ])
+        self.assertFalse(bt.battles_remaining())
+
+    @number("5.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_stream_batch_size(self):
+        bt = self.make_tower()
+        with self.assertRaises(ValueError):
+            next(bt.stream_results(batch_size=0))
+        batches = list(bt.stream_results(batch_size=BattleTower.BATCH_SIZE))
+        # Fewer battles than a batch, so a single batch holding just those.
+        self.assertListEqual([len(batch) for batch in batches], [6])
@@ -0,0 +1,184 @@
+"""
+Runs a whole BattleTower for each candidate player team across a process pool, and ranks
+the candidates on a leaderboard.
+
+Every tower gets its own stream split from RandomGen up front, so the leaderboard only
+depends on the RandomGen seed and never on the number of workers.
+With shared_teams=True the tower teams are generated once, and every candidate climbs
+the same tower.
+
+Usage:
+```
+RandomGen.set_seed(123)
+leaderboard = run_tournament(
+    [{"provided_monsters": ["Flamikin", "Vineon"]}, {"selection_mode": MonsterTeam.SelectionMode.RANDOM}],
+    n_teams=50,
+    workers=4,
+    shared_teams=True,
+)
+for run in leaderboard:
+    print(run)
+```
+"""
+from __future__ import annotations
+
+import argparse
+from multiprocessing import Pool
+from typing import Optional
+
+from battle import Battle
+from random_gen import RandomGen, RandomStream
+from simulation import TeamSpec, build_team
+from team import MonsterTeam
+from tower import BattleTower
+
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+# Tower teams as (monster names, lives) pairs, which unlike the teams themselves can be
+# sent to worker processes.
+SharedTeams = tuple[tuple[tuple[str, ...], int], ...]
+
+# The shared tower teams last built in this process: (SharedTeams, teams, snapshots).
+_shared_cache: Optional[tuple] = None
+
+
+class TowerRun:
+    """The outcome of one candidate's climb of a tower."""
+
+    def __init__(self, candidate: int) -> None:
+        self.candidate = candidate
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.teams_defeated = 0
+        self.player_lives = 0
+
+    def record(self, result: Battle.Result, tower_lives: int) -> None:
+        """O(1)"""
+        if result == Battle.Result.TEAM1:
+            self.wins += 1
+        elif result == Battle.Result.TEAM2:
+            self.losses += 1
+        else:
+            self.draws += 1
+        if tower_lives == 0 and result != Battle.Result.TEAM2:
+            self.teams_defeated += 1
+
+    def rank_key(self) -> tuple[int, int, int, int]:
+        """Sorts best first: most teams defeated, then most wins, then most lives left, then candidate order."""
+        return -self.teams_defeated, -self.wins, -self.player_lives, self.candidate
+
+    def __str__(self) -> str:
+        return (f"Candidate {self.candidate}: {self.teams_defeated} teams defeated, {self.player_lives} lives left "
+                f"({self.wins}W/{self.losses}L/{self.draws}D)")
+
+
+def generate_shared_teams(n_teams: int, stream: RandomStream | type[RandomGen] = RandomGen) -> SharedTeams:
+    """
+    Generates tower teams the same way BattleTower.generate_teams does, as picklable records.
+    O(n * m) - Where n is the number of teams and m the team size.
+    """
+    teams = []
+    for _ in range(n_teams):
+        team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM, stream=stream)
+        monsters = team.get_monsters()
+        names = tuple(monsters[i].get_name() for i in range(len(monsters)))
+        teams.append((names, stream.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES)))
+    return tuple(teams)
+
+
+def _shared_tower_teams(shared: SharedTeams) -> tuple[ArrayR[MonsterTeam], ArrayR]:
+    """
+    Builds the shared teams once per process, and returns them with their starting snapshots.
+    O(n * m) the first time, O(1) after.
+    """
+    global _shared_cache
+    if _shared_cache is None or _shared_cache[0] != shared:
+        teams = ArrayR[MonsterTeam](len(shared))
+        snapshots = ArrayR(len(shared))
+        for i in range(len(shared)):
+            teams[i] = build_team({"team_mode": MonsterTeam.TeamMode.BACK, "provided_monsters": shared[i][0]})
+            snapshots[i] = teams[i].snapshot()
+        _shared_cache = (shared, teams, snapshots)
+    return _shared_cache[1], _shared_cache[2]
+
+
+def _run_tower(args: tuple[int, TeamSpec, RandomStream, int, Optional[SharedTeams], Optional[TeamSpec]]) -> TowerRun:
+    """
+    Climbs one tower with one candidate.
+    O(b * t) - Where b is the number of battles and t the turns per battle.
+    """
+    candidate, spec, stream, n_teams, shared, tower_team = args
+    with RandomGen.using(stream):
+        tower = BattleTower(Battle(verbosity=0, fast=True), stream=stream)
+        tower.set_my_team(build_team(spec, stream))
+        if shared is not None:
+            teams, snapshots = _shared_tower_teams(shared)
+            for i in range(len(teams)):
+                # The last tower left the team as its last battle did.
+                teams[i].restore(snapshots[i])
+                tower.add_team(teams[i], shared[i][1])
+        elif tower_team is not None:
+            for _ in range(n_teams):
+                tower.add_team(build_team(tower_team, stream), stream.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES))
+        else:
+            tower.generate_teams(n_teams)
+        run = TowerRun(candidate)
+        while tower.battles_remaining():
+            result, _, _, run.player_lives, tower_lives = tower.next_battle()
+            run.record(result, tower_lives)
+    return run
+
+
+def run_tournament(
+    candidates: list[TeamSpec],
+    n_teams: int,
+    workers: int = 1,
+    shared_teams: bool = False,
+    tower_team: Optional[TeamSpec] = None,
+) -> ArrayR[TowerRun]:
+    """
+    Climbs a tower of n_teams teams with each candidate team spec, and returns the runs best first.
+    With workers=1 the towers are run in this process.
+
+    :tower_team: Spec the tower teams are built from. Defaults to the random teams of
+        BattleTower.generate_teams. Shared teams are always random monsters, so the two
+        can't be combined.
+
+    Best case: O(c * b * t / workers)
+    Worst case: O(c * b * t / workers) - Where c is the number of candidates, b the battles
+    per tower and t the turns per battle.
+    """
+    if shared_teams and tower_team is not None:
+        raise ValueError("tower_team can't be used with shared_teams.")
+    shared = generate_shared_teams(n_teams, RandomGen.split()) if shared_teams else None
+    tasks = [(i, candidates[i], RandomGen.split(), n_teams, shared, tower_team) for i in range(len(candidates))]
+    leaderboard = ArraySortedList(len(tasks))
+    if workers <= 1:
+        for run in map(_run_tower, tasks):
+            leaderboard.add(ListItem(run, run.rank_key()))
+    else:
+        with Pool(workers) as pool:
+            for run in pool.imap_unordered(_run_tower, tasks):
+                leaderboard.add(ListItem(run, run.rank_key()))
+    ranked = ArrayR[TowerRun](len(leaderboard))
+    for i in range(len(leaderboard)):
+        ranked[i] = leaderboard[i].value
+    return ranked
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Rank candidate teams by climbing a battle tower with each.")
+    p.add_argument("candidates", nargs="+", help="Comma separated monster names per candidate, or RANDOM.")
+    p.add_argument("-n", "--teams", type=int, default=10, help="Number of teams in each tower.")
+    p.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes.")
+    p.add_argument("-s", "--seed", type=int, default=None, help="Seed for RandomGen.")
+    p.add_argument("--shared", action="store_true", help="Climb the same tower with every candidate.")
+    args = p.parse_args()
+
+    RandomGen.set_seed(args.seed)
+    specs = [{} if names.upper() == "RANDOM" else {"provided_monsters": names.split(",")} for names in args.candidates]
+    for rank, run in enumerate(run_tournament(specs, args.teams, args.workers, args.shared), start=1):
+        print(f"{rank}. {run}")
@@ -1,25 +1,74 @@
 from __future__ import annotations
 
-from random_gen import RandomGen
+from typing import Iterator, NamedTuple, Optional
+
+from random_gen import RandomGen, RandomStream
 from team import MonsterTeam
 from battle import Battle
 
-from elements import Element
+from elements import Element, ElementSet
 
+from data_structures.queue_adt import CircularDeque
 from data_structures.referential_array import ArrayR
+from data_structures.stack_adt import ArrayStack
+
+class BattleRecord(NamedTuple):
+    """The outcome of one tower battle, without any references to the teams."""
+
+    result: Battle.Result
+    tower_team: int     # The team_id of the tower team
+    player_lives: int   # Lives after the battle
+    tower_lives: int
+    turns: int
+
+class ResultFileWriter:
+    """
+    Appends batches of BattleRecords to a text file, one comma separated line per battle:
+    result,tower_team,player_lives,tower_lives,turns
+    """
+
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "a")
+
+    def write(self, batch: ArrayR[BattleRecord]) -> None:
+        """O(k) - Where k is the batch size."""
+        self.file.writelines(
+            f"{record.result.name},{record.tower_team},{record.player_lives},{record.tower_lives},{record.turns}\n"
+            for record in batch
+        )
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> ResultFileWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 class BattleTower:
 
     MIN_LIVES = 2
     MAX_LIVES = 10
+    BATCH_SIZE = 1000
 
-    def __init__(self, battle: Battle|None=None) -> None:
+    def __init__(self, battle: Battle|None=None, stream: RandomStream|type[RandomGen]=RandomGen) -> None:
         """
         O(1) - Time complexity is constant, only involves creating battle instance.
+
+        :stream: Where lives and generated teams draw random numbers from.
         """
         self.battle = battle or Battle(verbosity=0)
+        self.stream = stream
         self.player_team = None
-        self.tower_teams = []
+        # Teams still with lives, in the order they battle. A team that survives a battle
+        # goes to the back, and a team out of lives is never queued again.
+        self.tower_teams = CircularDeque[MonsterTeam](MonsterTeam.TEAM_LIMIT)
+        # Each generated team gets the next team_id, so records can refer to teams by id.
+        self.teams_generated = 0
+        # Every element of a team that has battled so far. See out_of_meta.
+        self.seen_elements = ElementSet()
 
     def set_my_team(self, team: MonsterTeam) -> None:
         """
@@ -27,22 +76,38 @@ class BattleTower:
         It will always be O(1) regardless of the value.
         """
         self.player_team = team
-        self.player_team.lives = RandomGen.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES + 1)
+        self.player_team.lives = self.stream.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES)
+        # Every battle starts from the team as it is now, see __next__.
+        self.player_team.initial_state = team.snapshot()
+        self.player_team.elements = self.team_elements(team)
 
     def generate_teams(self, n: int) -> None:
         """
         O(n), since it is dependent on the number of different teams generated.
+        Each team is queued at the back of the tower.
         """
         for _ in range(n):
-            team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
-            team.lives = RandomGen.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES + 1)
-            self.tower_teams.append(team)
+            team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM, stream=self.stream)
+            self.add_team(team, self.stream.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES))
+
+    def add_team(self, team: MonsterTeam, lives: int) -> None:
+        """
+        Queues an already built team at the back of the tower, e.g. one shared between towers.
+        Every battle restores the team as it is now.
+        O(n) - Where n is the team size.
+        """
+        team.lives = lives
+        team.initial_state = team.snapshot()
+        team.elements = self.team_elements(team)
+        team.team_id = self.teams_generated
+        self.teams_generated += 1
+        self.tower_teams.append(team)
 
     def battles_remaining(self) -> bool:
         """
-        O(n), since it considers the teams assigned from the generate_teams method, analyzing the amount of lives.
+        O(1) - Only teams with lives are queued, so the queue's length is the number of teams alive.
         """
-        return self.player_team.lives > 0 and any(team.lives > 0 for team in self.tower_teams)
+        return self.player_team.lives > 0 and not self.tower_teams.is_empty()
 
     def __iter__(self):
         """
@@ -51,16 +116,24 @@ class BattleTower:
         return self
 
     def __next__(self) -> tuple[Battle.Result, MonsterTeam, MonsterTeam, int, int]:
+        """O(1) - See next_battle."""
+        return self.next_battle()
+
+    def next_battle(self) -> tuple[Battle.Result, MonsterTeam, MonsterTeam, int, int]:
         """
-        O(1), since it simply creates commands to execute the battle and modifies the values in the amount of lives remaining.
+        Battles the player team against the next tower team, returning the result,
+        both teams and both teams' lives after the battle.
+        O(1) - Besides the battle itself.
         """
         if not self.battles_remaining():
             raise StopIteration
 
-        tower_team = self.tower_teams.pop(0)
+        tower_team = self.tower_teams.serve()
+        # Battles drain the teams, so put both back as they started, without rebuilding monsters.
+        self.player_team.restore(self.player_team.initial_state)
+        tower_team.restore(tower_team.initial_state)
         result = self.battle.battle(self.player_team, tower_team)
-        player_lives = self.player_team.lives
-        tower_lives = tower_team.lives
+        self.seen_elements = self.seen_elements.union(self.player_team.elements).union(tower_team.elements)
 
         if result == Battle.Result.TEAM1:
             tower_team.lives -= 1
@@ -69,15 +142,132 @@ class BattleTower:
         else:  # Draw
             self.player_team.lives -= 1
             tower_team.lives -= 1
+        if tower_team.lives > 0:
+            self.tower_teams.append(tower_team)
+
+        return result, self.player_team, tower_team, self.player_team.lives, tower_team.lives
+
+    def stream_results(self, batch_size: int = BATCH_SIZE, sink: Optional[ResultFileWriter] = None) -> Iterator[ArrayR[BattleRecord]]:
+        """
+        Runs the remaining battles, yielding their BattleRecords in batches of batch_size
+        (the last batch may be smaller). Each batch is also written to sink, if given,
+        which can be a ResultFileWriter or anything else with a write(batch) method.
+        Records hold no teams, so only the batch being filled is kept alive here.
+        Best case: O(b)
+        Worst case: O(b) - Besides the battles themselves, where b is the number of battles.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, not {batch_size}.")
+        batch = ArrayR[BattleRecord](batch_size)
+        filled = 0
+        while self.battles_remaining():
+            result, _, tower_team, player_lives, tower_lives = self.next_battle()
+            batch[filled] = BattleRecord(result, tower_team.team_id, player_lives, tower_lives, self.battle.turn_number)
+            filled += 1
+            if filled == batch_size:
+                yield self._flush(batch, sink)
+                batch = ArrayR[BattleRecord](batch_size)
+                filled = 0
+        if filled > 0:
+            last = ArrayR[BattleRecord](filled)
+            for i in range(filled):
+                last[i] = batch[i]
+            yield self._flush(last, sink)
+
+    @staticmethod
+    def _flush(batch: ArrayR[BattleRecord], sink: Optional[ResultFileWriter]) -> ArrayR[BattleRecord]:
+        if sink is not None:
+            sink.write(batch)
+        return batch
+
+    def sort_by_lives(self) -> None:
+        """
+        Reorders the remaining tower teams from fewest to most lives, keeping the current
+        order between teams with the same lives.
+        Best case: O(n + L)
+        Worst case: O(n + L) - A counting sort, where L is the most lives of any team.
+        """
+        n = len(self.tower_teams)
+        teams = ArrayR[MonsterTeam](n)
+        most_lives = 0
+        for i in range(n):
+            teams[i] = self.tower_teams.serve()
+            most_lives = max(most_lives, teams[i].lives)
+        # starts[lives] is where the first team with those lives goes.
+        starts = ArrayR[int](most_lives + 2)
+        for lives in range(most_lives + 2):
+            starts[lives] = 0
+        for i in range(n):
+            starts[teams[i].lives + 1] += 1
+        for lives in range(1, most_lives + 2):
+            starts[lives] += starts[lives - 1]
+        ordered = ArrayR[MonsterTeam](n)
+        for i in range(n):
+            lives = teams[i].lives
+            ordered[starts[lives]] = teams[i]
+            starts[lives] += 1
+        for i in range(n):
+            self.tower_teams.append(ordered[i])
+
+    def out_of_meta(self) -> ElementSet:
+        """
+        Returns the elements of teams that have battled, which are in neither team of the next battle.
+        Best case: O(1)
+        Worst case: O(1) - A union and a difference of the teams' element sets, which are O(1) on bitsets.
+        """
+        in_meta = self.player_team.elements
+        if not self.tower_teams.is_empty():
+            in_meta = in_meta.union(self.tower_teams.peek().elements)
+        return self.seen_elements.difference(in_meta)
+
+    @staticmethod
+    def team_elements(team: MonsterTeam) -> ElementSet:
+        """
+        Returns the elements of the monsters in the team.
+        O(n) - Where n is the team size.
+        """
+        elements = ElementSet()
+        monsters = team.get_monsters()
+        for i in range(len(monsters)):
+            elements.add(Element.from_string(monsters[i].get_element()).value)
+        return elements
 
-        return result, self.player_team, tower_team, player_lives, tower_lives
+def tournament_balanced(tournament_str: ArrayR[str]) -> bool:
+    """
+    Checks a tournament in postfix notation, where "+" is a match between the two brackets
+    before it and anything else is a team, describes a single bracket in which both sides
+    of every match have the same number of teams.
 
-    def out_of_meta(self) -> ArrayR[Element]:
-        """"""
-        elements_present = set()
-        for team in self.tower_teams:
-            elements_present.update(monster.element for monster in team.monsters)
-        return ArrayR([element for element in Element if element not in elements_present])
+    The stack holds the sizes of the finished brackets not yet matched. Two neighbours on it
+    can only ever be matched with each other, so in a balanced tournament every size is
+    bigger than the one above it, except for a pair waiting on its "+". Anything else
+    fails straight away, which keeps the stack at most log2(n) + 2 deep.
+    Best case: O(1) - When the start of the tournament is already unbalanced.
+    Worst case: O(n) time and O(log n) memory - Where n is the length of the tournament.
+    """
+    n = len(tournament_str)
+    stack = ArrayStack[int](n.bit_length() + 2)
+    pair_waiting = False
+    for i in range(n):
+        if tournament_str[i] == "+":
+            if len(stack) < 2:
+                return False
+            right = stack.pop()
+            left = stack.pop()
+            if left != right:
+                return False
+            size = left + right
+        elif pair_waiting:
+            return False
+        else:
+            size = 1
+        pair_waiting = False
+        if not stack.is_empty():
+            if stack.peek() < size:
+                return False
+            pair_waiting = stack.peek() == size
+        stack.push(size)
+    return len(stack) == 1
 
 if __name__ == "__main__":
 